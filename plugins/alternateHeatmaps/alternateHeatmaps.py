@@ -23,6 +23,7 @@ sys.path.insert(
 from funscript_utils import (  # noqa: E402
     find_funscript_paths,
     read_funscript_json,
+    read_funscript_header,
     is_merged_funscript,
     read_stdin,
     write_stdout,
@@ -36,10 +37,6 @@ from funscript_utils import (  # noqa: E402
     save_plugin_setting
 )
 
-sys.path.insert(
-    0,
-    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'funUtil')
-)
 from funlib_py import Funscript  # noqa: E402
 
 
@@ -165,13 +162,14 @@ def generate_heatmap(
     for merged_path in merged_candidates:
         if os.path.exists(merged_path):
             log(f"  Found {os.path.basename(merged_path)}")
-            data = read_funscript_json(merged_path)
+            # actions are only decoded once the file is known to be merged
+            data = read_funscript_header(merged_path)
             if data and is_merged_funscript(data):
                 log(
                     f"  Using merged funscript: "
                     f"{os.path.basename(merged_path)}"
                 )
-                funscript_data = data
+                funscript_data = read_funscript_json(merged_path)
                 funscript_filename = os.path.basename(merged_path)
                 break
             elif data:
@@ -190,8 +188,7 @@ def generate_heatmap(
             return False
 
         if len(scripts_paths) == 1:
-            single_key = list(scripts_paths.keys())[0]
-            single_path = list(scripts_paths.values())[0]
+            single_key, single_path = next(iter(scripts_paths.items()))
             log(f"  Using single funscript: {single_key}")
             funscript_data = read_funscript_json(single_path)
             funscript_filename = os.path.basename(single_path)
@@ -323,7 +320,7 @@ def generate_heatmaps_with_variants(
         # scripts_paths is a dict like {'main': 'path.funscript', 'pitch': 'path.pitch.funscript'}
         if len(scripts_paths) == 1:
             # Single script - just read it
-            script_path = list(scripts_paths.values())[0]
+            script_path = next(iter(scripts_paths.values()))
             funscript_data = read_funscript_json(script_path)
         else:
             # Multiple scripts (main + axes) - merge them
@@ -467,7 +464,7 @@ def main():
             log("=" * 60)
             log("Querying Stash for interactive scenes...")
 
-            scenes = query_interactive_scenes(server_url, cookies)
+            scenes = query_interactive_scenes(server_url, cookies, include_title=False)
 
             if not scenes:
                 log("No interactive scenes with funscripts found")
@@ -33,6 +33,9 @@ ensure_dependencies()
 import stashapi.log as logger
 from config import config  # Importing config from config.py
 
+# Every find/create request goes through one session so the connection is reused
+session = requests.Session()
+
 def graphql_request(query, variables=None):
     headers = {
         "Accept-Encoding": "gzip, deflate, br",
@@ -43,7 +46,7 @@ def graphql_request(query, variables=None):
     # Only add API key header if it's provided
     if config["api_key"]:
         headers["ApiKey"] = config["api_key"]
-    response = requests.post(config['endpoint'], json={'query': query, 'variables': variables}, headers=headers)
+    response = session.post(config['endpoint'], json={'query': query, 'variables': variables}, headers=headers)
     try:
         data = response.json()
         if "errors" in data:
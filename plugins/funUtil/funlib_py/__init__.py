@@ -15,6 +15,9 @@ if TYPE_CHECKING:
 __all__ = ['FunAction', 'FunChapter', 'FunBookmark', 'FunMetadata', 'FunscriptFile', 'Funscript', 'FunChannel']
 
 
+_actionJsonKeys = frozenset(('at', 'pos'))
+
+
 class FunAction:
     """Represents a single action point in a funscript."""
 
@@ -25,17 +28,25 @@ class FunAction:
     # --- Constructor ---
     def __init__(self, action: Optional[JsonAction] = None):
         if action:
-            self.at = action.get('at', 0) if isinstance(action, dict) else action.at
-            self.pos = action.get('pos', 0) if isinstance(action, dict) else action.pos
+            if isinstance(action, dict):
+                self.at = action.get('at', 0)
+                self.pos = action.get('pos', 0)
+            else:
+                self.at = action.at
+                self.pos = action.pos
 
     # --- JSON & Clone Section ---
     jsonShape = {'at': None, 'pos': None}
 
     def toJSON(self) -> JsonAction:
-        return orderTrimJson(self, {
+        jsonAction = {
             'at': round(self.at, 1),
             'pos': round(self.pos, 1),
-        })
+        }
+        # plain at/pos actions are already in shape order, skip the generic orderTrimJson pass
+        if self.__dict__.keys() <= _actionJsonKeys and type(self).jsonShape is FunAction.jsonShape:
+            return jsonAction
+        return orderTrimJson(self, jsonAction)
 
     def clone(self) -> 'FunAction':
         return clone(self)
@@ -7,7 +7,28 @@ if TYPE_CHECKING:
     from .types import timeSpan, ms, seconds, axis, channel, axisLike, speed
     from . import Funscript
 
-from .misc import clamplerp, compareWithOrder
+from .misc import makeComparator
+
+_TRIG_CACHE_SIZE = 4096
+_trigCache: Dict[float, Tuple[float, float]] = {}
+
+
+def hueToCosSin(h: float) -> Tuple[float, float]:
+    """
+    (cos, sin) of a hue in degrees, memoized: speeds of integer at/pos steps
+    repeat, so the same angles are converted over and over
+    """
+    cos_sin = _trigCache.get(h)
+    if cos_sin is not None:
+        return cos_sin
+    h_rad = h * math.pi / 180.0
+    cos_sin = (math.cos(h_rad), math.sin(h_rad))
+    _trigCache[h] = cos_sin
+    # hues are exact floats, keep the cache from growing without bound like _hexCache
+    if len(_trigCache) > _TRIG_CACHE_SIZE:
+        del _trigCache[next(iter(_trigCache))]
+    return cos_sin
+
 
 # Import oklch2hex from colorizr equivalent
 try:
@@ -33,9 +54,9 @@ except ImportError:
         https://bottosson.github.io/posts/oklab/
         """
         # Convert LCH to Lab
-        h_rad = h * math.pi / 180.0
-        a = c * math.cos(h_rad)
-        b = c * math.sin(h_rad)
+        cos_h, sin_h = hueToCosSin(h)
+        a = c * cos_h
+        b = c * sin_h
         
         # OKLab to linear RGB (via LMS cone space)
         l_ = lightness + 0.3963377774 * a + 0.2158037573 * b
@@ -109,6 +130,18 @@ def secondsToDuration(seconds: 'seconds') -> str:
     return f"{int(seconds / 60 / 60)}:{str(int(seconds / 60 % 60)).zfill(2)}:{str(int(seconds % 60)).zfill(2)}"
 
 
+_funscriptClass: Optional[type] = None
+
+
+def _getFunscriptClass() -> type:
+    # resolved lazily: the package __init__ imports this module
+    global _funscriptClass
+    if _funscriptClass is None:
+        from . import Funscript
+        _funscriptClass = Funscript
+    return _funscriptClass
+
+
 def orderTrimJson(that: Any, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     shape = getattr(type(that), 'jsonShape', None) if hasattr(that, '__class__') else None
     if not shape or not isinstance(shape, dict):
@@ -136,12 +169,14 @@ def orderTrimJson(that: Any, overrides: Optional[Dict[str, Any]] = None) -> Dict
     if 'channels' in copy and isinstance(copy['channels'], dict):
         channels_dict = copy['channels']
         # Check if any value is a Funscript object (not serialized)
-        from funlib_py import Funscript
-        for key, value in list(channels_dict.items()):
-            if isinstance(value, Funscript):
-                # This shouldn't happen - channels should already be serialized
-                # But handle it anyway
-                channels_dict[key] = value.toJSON()
+        funscriptClass = _getFunscriptClass()
+        if any(isinstance(value, funscriptClass) for value in channels_dict.values()):
+            # This shouldn't happen - channels should already be serialized
+            # But handle it anyway
+            copy['channels'] = {
+                key: value.toJSON() if isinstance(value, funscriptClass) else value
+                for key, value in channels_dict.items()
+            }
 
     keys_to_delete = []
     for k, v in shape.items():
@@ -237,25 +272,25 @@ def axisLikeToAxis(axisLike: Optional[Union['axisLike', str]]) -> 'axis':
     raise ValueError(f"axisLikeToAxis: {axisLike} is not supported")
 
 
+_compareChannels = makeComparator(channelNames)
+
+
 def orderByChannel(a: 'Funscript', b: 'Funscript') -> int:
-    return compareWithOrder(a.channel, b.channel, channelNames)
+    return _compareChannels(a.channel, b.channel)
 
 
 def fileNameToInfo(filePath: Optional[str] = None) -> Dict[str, Any]:
-    parts = filePath.split('.') if filePath else []
-    if parts and parts[-1] == 'funscript':
-        parts.pop()
+    fileName = filePath or ''
+    head, _, tail = fileName.rpartition('.')
+    if tail == 'funscript':
+        fileName = head
+        head, _, tail = fileName.rpartition('.')
 
-    axisLike = parts[-1] if parts else None
-    if axisLike in axisLikes:
-        parts.pop()
-    elif axisLike == 'singleaxis':
-        parts.pop()
-    else:
-        axisLike = None
+    axisLike = tail if tail in axisLikes or tail == 'singleaxis' else None
+    if axisLike:
+        fileName = head
 
-    fileName = '.'.join(parts)
-    title = fileName.split('/')[-1].split('\\')[-1] if fileName else ''
+    title = fileName[max(fileName.rfind('/'), fileName.rfind('\\')) + 1:]
 
     return {
         'filePath': filePath,
@@ -349,21 +384,42 @@ speedToOklchParams = {
 }
 
 
-def speedToOklch(speed: 'speed', useAlpha: bool = False) -> Tuple[float, float, float, float]:
-    def roll(value: float, cap: float) -> float:
-        return (value % cap + cap) % cap
+# speedToOklchParams frozen into floats so the per-color path skips dict lookups
+_L_LEFT = float(speedToOklchParams['l']['left'])
+_L_RIGHT = float(speedToOklchParams['l']['right'])
+_L_FROM = float(speedToOklchParams['l']['from'])
+_L_TO = float(speedToOklchParams['l']['to'])
+_C_LEFT = float(speedToOklchParams['c']['left'])
+_C_RIGHT = float(speedToOklchParams['c']['right'])
+_C_FROM = float(speedToOklchParams['c']['from'])
+_C_TO = float(speedToOklchParams['c']['to'])
+_H_SPEED = float(speedToOklchParams['h']['speed'])
+_H_OFFSET = float(speedToOklchParams['h']['offset'])
+_A_LEFT = float(speedToOklchParams['a']['left'])
+_A_RIGHT = float(speedToOklchParams['a']['right'])
+_A_FROM = float(speedToOklchParams['a']['from'])
+_A_TO = float(speedToOklchParams['a']['to'])
 
-    lightness = clamplerp(speed, speedToOklchParams['l']['left'], speedToOklchParams['l']['right'],
-                  speedToOklchParams['l']['from'], speedToOklchParams['l']['to'])
-    c = clamplerp(speed, speedToOklchParams['c']['left'], speedToOklchParams['c']['right'],
-                  speedToOklchParams['c']['from'], speedToOklchParams['c']['to'])
-    h = roll(speedToOklchParams['h']['offset'] + speed / speedToOklchParams['h']['speed'], 360)
-    a = clamplerp(speed, speedToOklchParams['a']['left'], speedToOklchParams['a']['right'],
-                  speedToOklchParams['a']['from'], speedToOklchParams['a']['to'])
+
+def speedToOklch(speed: 'speed', useAlpha: bool = False) -> Tuple[float, float, float, float]:
+    # inlined clamplerp(speed, left, right, from, to) and roll(h, 360)
+    t = max(0.0, min(1.0, (speed - _L_LEFT) / (_L_RIGHT - _L_LEFT)))
+    lightness = _L_FROM * (1 - t) + _L_TO * t
+    t = max(0.0, min(1.0, (speed - _C_LEFT) / (_C_RIGHT - _C_LEFT)))
+    c = _C_FROM * (1 - t) + _C_TO * t
+    h = ((_H_OFFSET + speed / _H_SPEED) % 360 + 360) % 360
+    t = max(0.0, min(1.0, (speed - _A_LEFT) / (_A_RIGHT - _A_LEFT)))
+    a = _A_FROM * (1 - t) + _A_TO * t
 
     return (lightness, c, h, a)
 
 
+def _toFixed(value: float, precision: int) -> str:
+    # JS-style toFixed with trailing zeros (and a bare trailing dot) trimmed
+    text = f"{value:.{precision}f}"
+    return text.rstrip('0').rstrip('.') if '.' in text else text
+
+
 def speedToOklchText(speed: 'speed', useAlpha: bool = False) -> str:
     """
     in css:
@@ -374,11 +430,8 @@ def speedToOklchText(speed: 'speed', useAlpha: bool = False) -> str:
     """
     l, c, h, a = speedToOklch(speed, useAlpha)
 
-    def toFixed(value: float, precision: int) -> str:
-        return re.sub(r'\.?0+$', '', f"{value:.{precision}f}")
-
-    alpha_str = f" / {toFixed(a, 3)}" if useAlpha else ""
-    return f"oklch({toFixed(l * 100, 3)}% {toFixed(c, 3)} {toFixed(h, 1)}{alpha_str})"
+    alpha_str = f" / {_toFixed(a, 3)}" if useAlpha else ""
+    return f"oklch({_toFixed(l * 100, 3)}% {_toFixed(c, 3)} {_toFixed(h, 1)}{alpha_str})"
 
 
 def speedToHex(speed: 'speed') -> str:
@@ -386,23 +439,39 @@ def speedToHex(speed: 'speed') -> str:
     return oklch2hex({'l': l, 'c': c, 'h': h})
 
 
+_HEX_CACHE_SIZE = 4096
 _hexCache: Dict['speed', str] = {}
 
 def speedToHexCached(speed: 'speed') -> str:
-    if speed in _hexCache:
-        return _hexCache[speed]
+    hex_val = _hexCache.get(speed)
+    if hex_val is not None:
+        return hex_val
     hex_val = speedToHex(abs(speed))
     _hexCache[speed] = hex_val
+    # merged line speeds are arbitrary floats, keep the cache from growing without bound
+    if len(_hexCache) > _HEX_CACHE_SIZE:
+        del _hexCache[next(iter(_hexCache))]
     return hex_val
 
 
+_TCODE_RE = re.compile(r'\b([LR])(\d)(\d+)(?:([IS])(\d+))?')
+
+
 def formatTCode(tcode: str, format: bool = True) -> str:
     if not format:
         return tcode
-    return re.sub(
-        r'\b([LR])(\d)(\d+)(?:([IS])(\d+))?',
-        lambda m: f"{m.group(1)}{m.group(2)}{m.group(3).rjust(4, '_')}"
-                  f"{'_' + m.group(4) if m.group(4) else ''}"
-                  f"{m.group(5).rjust(4, '_') if m.group(5) else ''}",
-        tcode
-    )
+    out = []
+    pos = 0
+    for m in _TCODE_RE.finditer(tcode):
+        axisType, axisIndex, value, command, commandValue = m.groups()
+        out.append(tcode[pos:m.start()])
+        out.append(axisType)
+        out.append(axisIndex)
+        out.append(value.rjust(4, '_'))
+        if command:
+            out.append('_')
+            out.append(command)
+            out.append(commandValue.rjust(4, '_'))
+        pos = m.end()
+    out.append(tcode[pos:])
+    return ''.join(out)
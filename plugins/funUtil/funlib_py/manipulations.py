@@ -1,44 +1,67 @@
-from typing import List, Tuple, Dict, Any, TYPE_CHECKING
-import math
+from typing import List, Tuple, Dict, Any, Iterable, Iterator, Optional, Sequence, TYPE_CHECKING
+from bisect import bisect_left
+from functools import cached_property
 
 if TYPE_CHECKING:
     from . import FunAction
     from .types import ms, pos, speed
 
 from .converter import secondsToDuration
-from .misc import absSpeedBetween, clamplerp, lerp, listToSum, minBy, speedBetween, unlerp
+from .misc import absSpeedBetween, clamplerp, lerp, listToSum, minBy, speedBetween
 
 
-def binaryFindLeftBorder(actions: List['FunAction'], at: 'ms') -> int:
+class _AtView:
+    """Read-only sequence of `at` values over an actions list, for bisect"""
+    __slots__ = ('actions',)
+
+    def __init__(self, actions: List['FunAction']):
+        self.actions = actions
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __getitem__(self, index: int) -> 'ms':
+        return self.actions[index].at
+
+
+def _leftBorder(ats: Sequence['ms'], at: 'ms') -> int:
+    N = len(ats)
+    if N <= 1:
+        return 0
+    if at < ats[0]:
+        return 0
+    if at > ats[-1]:
+        return N - 1
+
+    index = bisect_left(ats, at)
+    # Always return the left border (the action at or before the time)
+    if index > 0 and ats[index] > at:
+        return index - 1
+    return index
+
+
+def binaryFindLeftBorder(
+    actions: List['FunAction'],
+    at: 'ms',
+    ats: Optional[Sequence['ms']] = None,
+) -> int:
     """
     Finds the index of the action at or immediately before the specified time.
     Returns `0` if the time is before the first action.
     Returns rightmost of actions with same `at`
+    @param ats - Optional precomputed `at` values of actions (see actionsToArrays)
     """
-    if len(actions) <= 1:
-        return 0
-    if at < actions[0].at:
-        return 0
-    if at > actions[-1].at:
-        return len(actions) - 1
+    return _leftBorder(_AtView(actions) if ats is None else ats, at)
 
-    left = 0
-    right = len(actions) - 1
-
-    while left < right:
-        mid = (left + right) // 2
-        if actions[mid].at < at:
-            left = mid + 1
-        else:
-            right = mid
 
-    # Always return the left border (the action at or before the time)
-    if left > 0 and actions[left].at > at:
-        return left - 1
-    return left
+def binaryFindLeftBorderBatch(ats: Sequence['ms'], queries: Iterable['ms']) -> List[int]:
+    """
+    binaryFindLeftBorder for many times at once over precomputed `at` values
+    """
+    return [_leftBorder(ats, at) for at in queries]
 
 
-def clerpAt(actions: List['FunAction'], at: 'ms') -> 'pos':
+def clerpAt(actions: List['FunAction'], at: 'ms', ats: Optional[Sequence['ms']] = None) -> 'pos':
     from .types import pos as PosType
 
     if len(actions) == 0:
@@ -50,7 +73,7 @@ def clerpAt(actions: List['FunAction'], at: 'ms') -> 'pos':
     if at >= actions[-1].at:
         return actions[-1].pos
 
-    leftIndex = binaryFindLeftBorder(actions, at)
+    leftIndex = binaryFindLeftBorder(actions, at, ats)
     leftAction = actions[leftIndex]
     rightAction = actions[leftIndex + 1] if leftIndex + 1 < len(actions) else None
 
@@ -62,33 +85,15 @@ def clerpAt(actions: List['FunAction'], at: 'ms') -> 'pos':
     return PosType(clamplerp(at, leftAction.at, rightAction.at, leftAction.pos, rightAction.pos))
 
 
-def isPeak(actions: List['FunAction'], index: int) -> int:
+def _peakKind(speedTo: 'speed', speedFrom: 'speed') -> int:
     """
-    Determines if an action at given index is a peak
-    @returns -1 for valley, 0 for neither, 1 for peak
+    isPeak's rule for an inner action given the speeds into and out of it
     """
-    action = actions[index]
-    prevAction = actions[index - 1] if index > 0 else None
-    nextAction = actions[index + 1] if index < len(actions) - 1 else None
-
-    # if there is no prev or next action, it's a peak because we need peaks at corners
-    if not prevAction and not nextAction:
-        return 1
-    if not prevAction:
-        speedFrom = speedBetween(action, nextAction)
-        return 1 if speedFrom < 0 else 1
-    if not nextAction:
-        speedTo = speedBetween(prevAction, action)
-        return -1 if speedTo > 0 else -1
-
-    speedTo = speedBetween(prevAction, action)
-    speedFrom = speedBetween(action, nextAction)
-
     # Use sign comparison like TypeScript's Math.sign() which returns 0 for zero
     # Python's math.copysign treats 0 as positive, but Math.sign(0) === 0
-    signTo = 0 if speedTo == 0 else (1 if speedTo > 0 else -1)
-    signFrom = 0 if speedFrom == 0 else (1 if speedFrom > 0 else -1)
-    
+    signTo = (speedTo > 0) - (speedTo < 0)
+    signFrom = (speedFrom > 0) - (speedFrom < 0)
+
     if signTo == signFrom:
         return 0
 
@@ -99,6 +104,120 @@ def isPeak(actions: List['FunAction'], index: int) -> int:
     return 0
 
 
+def _actionPeakKind(
+    prevAction: Optional['FunAction'],
+    action: 'FunAction',
+    nextAction: Optional['FunAction'],
+) -> int:
+    """
+    isPeak for an action given its neighbours (None past either end)
+    """
+    # if there is no prev or next action, it's a peak because we need peaks at corners
+    if prevAction is None:
+        return 1
+    if nextAction is None:
+        return -1
+
+    # same as speedBetween, without the call overhead
+    speedTo = (0 if prevAction.at == action.at
+               else (action.pos - prevAction.pos) / (action.at - prevAction.at) * 1000)
+    speedFrom = (0 if action.at == nextAction.at
+                 else (nextAction.pos - action.pos) / (nextAction.at - action.at) * 1000)
+
+    return _peakKind(speedTo, speedFrom)
+
+
+def isPeak(actions: List['FunAction'], index: int) -> int:
+    """
+    Determines if an action at given index is a peak
+    @returns -1 for valley, 0 for neither, 1 for peak
+    """
+    action = actions[index]
+    prevAction = actions[index - 1] if index > 0 else None
+    nextAction = actions[index + 1] if index < len(actions) - 1 else None
+    return _actionPeakKind(prevAction, action, nextAction)
+
+
+def peaksMask(ats: Sequence['ms'], poss: Sequence['pos']) -> List[int]:
+    """
+    isPeak for every index in one pass over parallel at/pos lists
+    @returns list of -1 for valley, 0 for neither, 1 for peak
+    """
+    n = len(ats)
+    if n == 0:
+        return []
+    if n == 1:
+        return [1]
+
+    mask = [0] * n
+    mask[0] = 1
+    mask[-1] = -1
+
+    # _peakKind inlined, carrying the outgoing speed/sign over as the next incoming one
+    speedTo = 0 if ats[0] == ats[1] else (poss[1] - poss[0]) / (ats[1] - ats[0]) * 1000
+    signTo = (speedTo > 0) - (speedTo < 0)
+    for i in range(1, n - 1):
+        atFrom = ats[i]
+        atTo = ats[i + 1]
+        speedFrom = 0 if atFrom == atTo else (poss[i + 1] - poss[i]) / (atTo - atFrom) * 1000
+        signFrom = (speedFrom > 0) - (speedFrom < 0)
+        if signTo != signFrom:
+            if speedTo > speedFrom:
+                mask[i] = 1
+            elif speedTo < speedFrom:
+                mask[i] = -1
+        speedTo = speedFrom
+        signTo = signFrom
+
+    return mask
+
+
+def actionsToPeaksMask(actions: List['FunAction']) -> List[int]:
+    """
+    peaksMask for a list of actions
+    """
+    return peaksMask(*actionsToArrays(actions))
+
+
+class _Cached:
+    """
+    Lazily derived views of one actions list, so helpers working on the same
+    actions share a single peak/zigzag/segment traversal
+    """
+    def __init__(
+        self,
+        actions: List['FunAction'],
+        arrays: Optional[Tuple[List['ms'], List['pos']]] = None,
+    ):
+        self.actions = actions
+        if arrays is not None:
+            self.arrays = arrays
+
+    @cached_property
+    def arrays(self) -> Tuple[List['ms'], List['pos']]:
+        return actionsToArrays(self.actions)
+
+    @property
+    def ats(self) -> List['ms']:
+        return self.arrays[0]
+
+    @property
+    def poss(self) -> List['pos']:
+        return self.arrays[1]
+
+    @cached_property
+    def peaks(self) -> List[int]:
+        return peaksMask(*self.arrays)
+
+    @cached_property
+    def zigzag(self) -> List['FunAction']:
+        return actionsToZigzag(self.actions, self.peaks)
+
+    @cached_property
+    def segments(self) -> List[List['FunAction']]:
+        return splitToSegments(self.actions, self.peaks)
+
+
 class ActionLine(list):
     """Line segment between two actions with speed calculations"""
     def __init__(self, p: 'FunAction', e: 'FunAction', absSpeed: float):
@@ -111,64 +230,127 @@ class ActionLine(list):
         self.atEnd: float = 0
 
 
+def actionsToArrays(actions: List['FunAction']) -> Tuple[List['ms'], List['pos']]:
+    """
+    Splits actions into parallel `at` and `pos` lists
+    so hot loops can work on plain numbers instead of attribute lookups
+    """
+    return [e.at for e in actions], [e.pos for e in actions]
+
+
+def arraysToActions(ats: List['ms'], poss: List['pos']) -> List['FunAction']:
+    """
+    Inverse of actionsToArrays
+    """
+    from . import FunAction
+
+    return [FunAction({'at': at, 'pos': pos}) for at, pos in zip(ats, poss)]
+
+
+def arraysToLineSpeeds(
+    ats: List['ms'],
+    poss: List['pos'],
+) -> Tuple[List[int], List[float], List[int], List[float]]:
+    """
+    actionsToLines on parallel at/pos lists:
+    end index, absSpeed, speedSign and dat of every non-empty line
+    """
+    ends: List[int] = []
+    absSpeeds: List[float] = []
+    signs: List[int] = []
+    dats: List[float] = []
+    for i in range(1, len(ats)):
+        dat = ats[i] - ats[i - 1]
+        # zero-length lines are dropped, same as speedBetween's a.at == b.at guard
+        if not 0 < dat:
+            continue
+        speed = (poss[i] - poss[i - 1]) / dat * 1000
+        ends.append(i)
+        absSpeeds.append(abs(speed))
+        signs.append((speed > 0) - (speed < 0))
+        dats.append(dat)
+    return ends, absSpeeds, signs, dats
+
+
 def actionsToLines(actions: List['FunAction']) -> List[ActionLine]:
     """
     Converts an array of actions into an array of lines with speed calculations
     """
+    from .types import speed as SpeedType
+
+    ats, poss = actionsToArrays(actions)
+    ends, absSpeeds, signs, dats = arraysToLineSpeeds(ats, poss)
     lines = []
-    for i in range(1, len(actions)):
-        p = actions[i - 1]
-        e = actions[i]
-        speed = speedBetween(p, e)
-        line = ActionLine(p, e, abs(speed))
-        line.speed = speed
-        line.absSpeed = abs(speed)
-        line.speedSign = math.copysign(1, speed) if speed != 0 else 0
-        line.dat = e.at - p.at
-        line.atStart = p.at
-        line.atEnd = e.at
+    for i, absSpeed, speedSign, dat in zip(ends, absSpeeds, signs, dats):
+        line = ActionLine(actions[i - 1], actions[i], absSpeed)
+        line.speed = SpeedType(speedSign * absSpeed)
+        line.absSpeed = absSpeed
+        line.speedSign = speedSign
+        line.dat = dat
+        line.atStart = ats[i - 1]
+        line.atEnd = ats[i]
         lines.append(line)
 
-    return [e for e in lines if e[0].at < e[1].at]
+    return lines
 
 
-def actionsToZigzag(actions: List['FunAction']) -> List['FunAction']:
+def actionsToZigzag(
+    actions: List['FunAction'],
+    peaks: Optional[List[int]] = None,
+) -> List['FunAction']:
     """
     Filters actions to create a zigzag pattern by removing actions with same direction changes
+    @param peaks - precomputed actionsToPeaksMask(actions)
     """
-    return [e.clone() for i, e in enumerate(actions) if isPeak(actions, i)]
+    if peaks is None:
+        peaks = actionsToPeaksMask(actions)
+    return [e.clone() for e, peak in zip(actions, peaks) if peak]
 
 
-def mergeLinesSpeed(lines: List[ActionLine], mergeLimit: float) -> List[ActionLine]:
+def mergeSpeedRuns(
+    absSpeeds: List[float],
+    signs: List[int],
+    dats: List[float],
+    mergeLimit: float,
+) -> Iterator[Tuple[int, int, float]]:
     """
-    Merges line segments with similar speeds within a time limit
+    mergeLinesSpeed on parallel lists from arraysToLineSpeeds:
+    yields (start, stop, avgSpeed) for every run of lines to merge
     """
     if not mergeLimit:
-        return lines
+        return
 
-    j = 0
+    # each line belongs to exactly one run of equal speedSign, so one sweep visits every line once
+    n = len(signs)
     i = 0
-    while i < len(lines) - 1:
+    while i < n - 1:
+        speedSign = signs[i]
         j = i
-        while j < len(lines) - 1:
-            if lines[i].speedSign != lines[j + 1].speedSign:
-                break
+        while j < n - 1 and signs[j + 1] == speedSign:
             j += 1
 
-        f = lines[i:j + 1]
-        if i == j:
-            i = j + 1
-            continue
-        if listToSum([e.dat for e in f]) > mergeLimit:
-            i = j + 1
-            continue
-
-        avgSpeed = listToSum([e.absSpeed * e.dat for e in f]) / listToSum([e.dat for e in f])
-        for e in f:
-            e[2] = avgSpeed
+        if i != j:
+            datSum = listToSum(dats[i:j + 1])
+            if datSum <= mergeLimit:
+                yield i, j + 1, listToSum([absSpeeds[k] * dats[k] for k in range(i, j + 1)]) / datSum
 
         i = j + 1
 
+
+def mergeLinesSpeed(lines: List[ActionLine], mergeLimit: float) -> List[ActionLine]:
+    """
+    Merges line segments with similar speeds within a time limit
+    """
+    if not mergeLimit:
+        return lines
+
+    runs = mergeSpeedRuns(
+        [e.absSpeed for e in lines], [e.speedSign for e in lines], [e.dat for e in lines], mergeLimit,
+    )
+    for start, stop, avgSpeed in runs:
+        for e in lines[start:stop]:
+            e[2] = avgSpeed
+
     return lines
 
 
@@ -185,24 +367,28 @@ def smoothActions(actions: List['FunAction'], windowSize: int = 3) -> List['FunA
     """
     Smooths out action positions using a moving average
     """
-    from . import FunAction
-
     if windowSize < 2:
         return actions
 
-    result = []
-    for i, action in enumerate(actions):
-        start = max(0, i - windowSize // 2)
-        end = min(len(actions), start + windowSize)
-        window = actions[start:end]
-        avgPos = sum(a.pos for a in window) / len(window)
-        result.append(FunAction(at=action.at, pos=avgPos))
-
-    return result
-
-
-def actionsAverageSpeed(actions: List['FunAction']) -> float:
-    zigzag = actionsToZigzag(actions)
+    ats, poss = actionsToArrays(actions)
+    n = len(poss)
+    half = windowSize // 2
+    avgPoss = []
+    for i in range(n):
+        start = max(0, i - half)
+        end = min(n, start + windowSize)
+        avgPoss.append(sum(poss[start:end]) / (end - start))
+
+    return arraysToActions(ats, avgPoss)
+
+
+def actionsAverageSpeed(
+    actions: List['FunAction'],
+    peaks: Optional[List[int]] = None,
+    zigzag: Optional[List['FunAction']] = None,
+) -> float:
+    if zigzag is None:
+        zigzag = actionsToZigzag(actions, peaks)
     fast = []
     for i, e in enumerate(zigzag):
         prev = zigzag[i - 1] if i > 0 else None
@@ -222,44 +408,47 @@ def actionsAverageSpeed(actions: List['FunAction']) -> float:
     return numerator / (denominator or 1)
 
 
-def actionsRequiredMaxSpeed(actions: List['FunAction']) -> 'speed':
+def actionsRequiredMaxSpeed(
+    actions: List['FunAction'],
+    peaks: Optional[List[int]] = None,
+) -> 'speed':
     """
     while the device speed may be lower then the script's max speed
     the device doesn't have to actually reach it - it needs just enough so to reach the next peak fast enough
+    @param peaks - precomputed actionsToPeaksMask(actions)
     """
     from .types import speed as SpeedType
 
     if len(actions) < 2:
         return SpeedType(0)
 
-    requiredSpeeds: List[Tuple['speed', 'ms']] = []
+    if peaks is None:
+        peaks = actionsToPeaksMask(actions)
+
+    ats, poss = actionsToArrays(actions)
+    n = len(ats)
 
+    # fastest speed towards the next peak that stays active for at least 50ms
+    requiredSpeed = None
     nextPeakIndex = 0
-    for i in range(len(actions)):
-        a = actions[i]
+    for i in range(n):
         if nextPeakIndex == i:
             # Find next peak
             nextPeakIndex = -1
-            for idx in range(i + 1, len(actions)):
-                if isPeak(actions, idx) != 0:
+            for idx in range(i + 1, n):
+                if peaks[idx] != 0:
                     nextPeakIndex = idx
                     break
             if nextPeakIndex == -1:
                 break
-        nextPeak = actions[nextPeakIndex]
-        if not nextPeak:
-            break
-        requiredSpeeds.append((abs(speedBetween(a, nextPeak)), nextPeak.at - a.at))
-
-    # sort by speed descending
-    sorted_speeds = sorted(requiredSpeeds, key=lambda x: x[0], reverse=True)
-
-    # return speed that is active for at least 50ms
-    for required_speed, duration in sorted_speeds:
-        if duration >= 50:
-            return SpeedType(required_speed)
+        duration = ats[nextPeakIndex] - ats[i]
+        if not duration >= 50:
+            continue
+        speed = abs((poss[nextPeakIndex] - poss[i]) / duration * 1000)
+        if requiredSpeed is None or speed > requiredSpeed:
+            requiredSpeed = speed
 
-    return SpeedType(0)
+    return SpeedType(requiredSpeed if requiredSpeed is not None else 0)
 
 
 def smoothCurve(
@@ -279,38 +468,51 @@ def smoothCurve(
     radius = 5
 
     positions = [e.pos for e in curve]
+    ats = [e.at for e in curve]
+    n = len(curve)
 
-    for iter in range(iterations):
-        for i in range(len(curve)):
-            if preserveEnds and (i == 0 or i == len(curve) - 1):
-                continue
+    # weights depend only on `at`, so build each window once for all iterations
+    windows = []
+    for i in range(n):
+        if preserveEnds and (i == 0 or i == n - 1):
+            continue
+        lo = max(0, i - radius)
+        hi = min(n, i + radius + 1)
+        at = ats[i]
+        # triangular weight distribution
+        weights = [max(0, timeRadius - abs(ats[index] - at)) for index in range(lo, hi)]
+        weight_sum = 0
+        for weight in weights:
+            weight_sum += weight
+        windows.append((i, lo, hi, weights, weight_sum))
 
+    for iter in range(iterations):
+        for i, lo, hi, weights, weight_sum in windows:
             sum_val = 0
-            weight_sum = 0
-
-            for j in range(-radius, radius + 1):
-                index = i + j
-                if 0 <= index < len(curve):
-                    # triangular weight distribution
-                    weight = max(0, timeRadius - abs(curve[index].at - curve[i].at))
-                    sum_val += positions[index] * weight
-                    weight_sum += weight
-
+            for p, w in zip(positions[lo:hi], weights):
+                sum_val += p * w
             curve[i].pos = positions[i] = sum_val / weight_sum
 
     return curve
 
 
-def splitToSegments(actions: List['FunAction']) -> List[List['FunAction']]:
+def splitToSegments(
+    actions: List['FunAction'],
+    peaks: Optional[List[int]] = None,
+) -> List[List['FunAction']]:
     """
     Splits a curve into segments between peaks
+    @param peaks - precomputed actionsToPeaksMask(actions)
     """
+    if peaks is None:
+        peaks = actionsToPeaksMask(actions)
+
     segments: List[List['FunAction']] = []
     prevPeakIndex = -1
 
     # Find segments between peaks
-    for i in range(len(actions)):
-        if isPeak(actions, i) != 0:
+    for i, peak in enumerate(peaks):
+        if peak != 0:
             if prevPeakIndex != -1:
                 segments.append(actions[prevPeakIndex:i + 1])
             prevPeakIndex = i
@@ -322,14 +524,13 @@ def connectSegments(segments: List[List['FunAction']]) -> List['FunAction']:
     """
     Connects segments back into a single array of actions
     """
-    flat = []
+    # neighbouring segments share their boundary peak object, so drop it while joining
+    result: List['FunAction'] = []
     for segment in segments:
-        flat.extend(segment)
-
-    result = []
-    for i, e in enumerate(flat):
-        if i == 0 or e != flat[i - 1]:
-            result.append(e)
+        if result and segment and segment[0] is result[-1]:
+            result.extend(segment[1:])
+        else:
+            result.extend(segment)
 
     return result
 
@@ -348,8 +549,11 @@ def simplifyLinearCurve(
     simplifiedSegments = []
 
     for segment in segments:
+        ats, poss = actionsToArrays(segment)
+        lastIdx = len(segment) - 1
+
         # First check if the entire segment can be simplified to just endpoints
-        if lineDeviation(segment) <= threshold:
+        if _rangeLineDeviation(ats, poss, 0, lastIdx, threshold) <= threshold:
             simplifiedSegments.append([segment[0], segment[-1]])
             continue
 
@@ -357,13 +561,13 @@ def simplifyLinearCurve(
         startIdx = 0
 
         # Examine each potential line segment
-        while startIdx < len(segment) - 1:
+        while startIdx < lastIdx:
             endIdx = startIdx + 2  # At least consider the next point
 
             # Try to extend the current line segment as far as possible
-            while endIdx <= len(segment) - 1:
+            while endIdx <= lastIdx:
                 # Check if the current segment is straight enough
-                if lineDeviation(segment[startIdx:endIdx + 1]) > threshold:
+                if _rangeLineDeviation(ats, poss, startIdx, endIdx, threshold) > threshold:
                     break
                 endIdx += 1
 
@@ -410,64 +614,77 @@ def handySmooth(actions: List['FunAction']) -> List['FunAction']:
 
     # pass 2: remove non-peak actions that are too close to peaks
     def simplifySegment(segment: List['FunAction']) -> List['FunAction']:
-        if len(segment) <= 2:
-            return segment
-        first = segment[0]
-        last = segment[-1]
-        middle = segment[1:-1]
-
-        if lineDeviation(segment) <= HANDY_MAX_STRAIGHT_THRESHOLD:
-            return [first, last]
-        if absSpeedBetween(first, last) > HANDY_MAX_SPEED:
-            return [first, last]
-
-        # split to 2 parts cannot create too high speed
-        middle = [e for e in middle
-                  if absSpeedBetween(first, e) < HANDY_MAX_SPEED
-                  and absSpeedBetween(e, last) < HANDY_MAX_SPEED]
-
-        # middle cannot contain points too close to first or last
-        middle = [e for e in middle
-                  if e.at - first.at >= HANDY_MIN_INTERVAL
-                  and last.at - e.at >= HANDY_MIN_INTERVAL]
-
-        if not middle:
-            return [first, last]
-        if len(middle) == 1:
-            return straigten([first, middle[0], last])
-
-        middleDuration = middle[-1].at - middle[0].at
-        if middleDuration < HANDY_MIN_INTERVAL:
-            # can place only a single point in the middle
-            # find the point that is closest to the middle of the segment
-            middlePoint = minBy(middle, lambda e: abs(e.at - middleDuration / 2))
-            return straigten([first, middlePoint, last])
-
-        return [first] + simplifySegment(middle) + [last]
+        # peels [first, ...middle, last] layers in a loop instead of recursing into middle
+        heads: List['FunAction'] = []
+        tails: List['FunAction'] = []
+
+        def wrap(core: List['FunAction']) -> List['FunAction']:
+            return heads + core + tails[::-1]
+
+        while True:
+            if len(segment) <= 2:
+                return wrap(segment)
+            first = segment[0]
+            last = segment[-1]
+            middle = segment[1:-1]
+
+            if lineDeviation(segment) <= HANDY_MAX_STRAIGHT_THRESHOLD:
+                return wrap([first, last])
+            if absSpeedBetween(first, last) > HANDY_MAX_SPEED:
+                return wrap([first, last])
+
+            # split to 2 parts cannot create too high speed
+            middle = [e for e in middle
+                      if absSpeedBetween(first, e) < HANDY_MAX_SPEED
+                      and absSpeedBetween(e, last) < HANDY_MAX_SPEED]
+
+            # middle cannot contain points too close to first or last
+            middle = [e for e in middle
+                      if e.at - first.at >= HANDY_MIN_INTERVAL
+                      and last.at - e.at >= HANDY_MIN_INTERVAL]
+
+            if not middle:
+                return wrap([first, last])
+            if len(middle) == 1:
+                return wrap(straigten([first, middle[0], last]))
+
+            middleDuration = middle[-1].at - middle[0].at
+            if middleDuration < HANDY_MIN_INTERVAL:
+                # can place only a single point in the middle
+                # find the point that is closest to the middle of the segment
+                middlePoint = minBy(middle, lambda e: abs(e.at - middleDuration / 2))
+                return wrap(straigten([first, middlePoint, last]))
+
+            heads.append(first)
+            tails.append(last)
+            segment = middle
 
     filteredSegments = [simplifySegment(segment) for segment in segments]
     filteredActions = connectSegments(filteredSegments)
 
     # pass 3: merge points that are too close to each other
-    i = 1
-    while i < len(filteredActions):
+    # survivors are collected in order instead of popping from the middle of the list;
+    # `merged[-1]` is the (possibly already merged) previous point
+    merged: List['FunAction'] = filteredActions[:1]
+    for i in range(1, len(filteredActions)):
         # merge only poins that have <30 speed
         current = filteredActions[i]
-        prev = filteredActions[i - 1]
-        if isPeak(filteredActions, i) == 0 and isPeak(filteredActions, i - 1) == 0:
-            i += 1
+        prev = merged[-1]
+        nextAction = filteredActions[i + 1] if i + 1 < len(filteredActions) else None
+        prevPrev = merged[-2] if len(merged) > 1 else None
+        if (_actionPeakKind(prev, current, nextAction) == 0
+                and _actionPeakKind(prevPrev, prev, current) == 0):
+            merged.append(current)
             continue
         speed = absSpeedBetween(prev, current)
         if speed > 10:
-            i += 1
+            merged.append(current)
             continue
 
         prev.pos = lerp(prev.pos, current.pos, 0.5)
         prev.at = lerp(prev.at, current.at, 0.5)
-        # remove current point
-        filteredActions.pop(i)
-        i -= 1
-        i += 1
+        # current point is dropped
+    filteredActions = merged
 
     # filteredActions = filteredActions # linkList is noop
 
@@ -485,121 +702,144 @@ def handySmooth(actions: List['FunAction']) -> List['FunAction']:
     return filteredActions
 
 
-def lineDeviation(actions: List['FunAction']) -> float:
+def _rangeLineDeviation(
+    ats: Sequence['ms'],
+    poss: Sequence['pos'],
+    first: int,
+    last: int,
+    threshold: Optional[float] = None,
+) -> float:
     """
-    Calculates maximum deviation of points from a straight line between endpoints
+    lineDeviation over index range [first, last] of parallel at/pos lists, without slicing.
+    Stops early once a point deviates more than `threshold`
     """
-    if len(actions) <= 2:
+    if last - first < 2:
         return 0
 
-    first = actions[0]
-    last = actions[-1]
+    firstAt = ats[first]
+    firstPos = poss[first]
+    dat = ats[last] - firstAt
+    dpos = poss[last] - firstPos
 
     maxDeviation = 0
     # Check each point's distance from the line between first and last
-    for i in range(1, len(actions) - 1):
-        t = (actions[i].at - first.at) / (last.at - first.at)
-        expectedPos = first.pos + (last.pos - first.pos) * t
-        deviation = abs(actions[i].pos - expectedPos)
+    for i in range(first + 1, last):
+        t = (ats[i] - firstAt) / dat
+        expectedPos = firstPos + dpos * t
+        deviation = abs(poss[i] - expectedPos)
 
         if deviation > maxDeviation:
             maxDeviation = deviation
+            if threshold is not None and deviation > threshold:
+                break
 
     return maxDeviation
 
 
+def lineDeviation(actions: List['FunAction']) -> float:
+    """
+    Calculates maximum deviation of points from a straight line between endpoints
+    """
+    if len(actions) <= 2:
+        return 0
+
+    ats, poss = actionsToArrays(actions)
+    return _rangeLineDeviation(ats, poss, 0, len(actions) - 1)
+
+
 def limitPeakSpeed(actions: List['FunAction'], maxSpeed: float) -> List['FunAction']:
-    peaks = actionsToZigzag(actions)
+    cache = _Cached(actions)
 
-    poss = [e.pos for e in peaks]
+    # work on plain at/pos lists of the zigzag instead of cloned actions
+    ats = [at for at, peak in zip(cache.ats, cache.peaks) if peak]
+    poss = [pos for pos, peak in zip(cache.poss, cache.peaks) if peak]
+    n = len(poss)
     for iteration in range(10):
-        retry = False
         # First calculate all changes
-        lchanges = [0.0] * len(poss)
-        rchanges = [0.0] * len(poss)
-        for left_idx in range(len(poss) - 1):
+        lchanges = [0.0] * n
+        rchanges = [0.0] * n
+        for left_idx in range(n - 1):
             r = left_idx + 1
-            left = peaks[left_idx]
-            right = peaks[r]
-            absSpeed = abs(speedBetween(left, right))
+            dat = ats[r] - ats[left_idx]
+            height = poss[r] - poss[left_idx]
+            absSpeed = abs(height / dat * 1000) if dat != 0 else 0
             if absSpeed <= maxSpeed:
                 continue
-            height = right.pos - left.pos
             changePercent = (absSpeed - maxSpeed) / absSpeed
             totalChange = height * changePercent
             # Split into left and right changes
             lchanges[left_idx] += totalChange / 2
             rchanges[r] -= totalChange / 2
 
-        # Merge changes first
-        changes = []
-        for i in range(len(poss)):
+        # Merge changes and apply them all at once
+        for i in range(n):
             lchange = lchanges[i]
             rchange = rchanges[i]
             # If signs are different, use the max absolute value with original sign
             # If signs are same, sum them
-            if math.copysign(1, lchange) == math.copysign(1, rchange):
-                changes.append(lchange if abs(lchange) > abs(rchange) else rchange)
+            if (lchange >= 0) == (rchange >= 0):
+                poss[i] += lchange if abs(lchange) > abs(rchange) else rchange
             else:
-                changes.append(lchange + rchange)
-
-        # Apply all changes at once
-        for i in range(len(poss)):
-            poss[i] += changes[i]
-            peaks[i].pos = poss[i]
+                poss[i] += lchange + rchange
 
         speed = max(
-            abs(speedBetween(peaks[idx], peaks[idx + 1])) if idx + 1 < len(peaks) else 0
-            for idx in range(len(peaks))
+            abs((poss[idx + 1] - poss[idx]) / (ats[idx + 1] - ats[idx]) * 1000)
+            if idx + 1 < n and ats[idx + 1] != ats[idx] else 0
+            for idx in range(n)
         )
-        if speed > maxSpeed:
-            retry = True
-
-        if not retry:
+        if not speed > maxSpeed:
             break
 
-    segments = splitToSegments(actions)
-    for i in range(len(segments)):
-        newLeftPos = peaks[i].pos
-        newRightPos = peaks[i + 1].pos
-        segment = segments[i]
+    # stretch every segment onto its moved peaks; lerp/unlerp inlined for the inner loop
+    segments = cache.segments
+    for i, segment in enumerate(segments):
+        newLeftPos = poss[i]
+        newRightPos = poss[i + 1]
         leftAt = segment[0].at
         rightAt = segment[-1].at
-        for j in range(len(segment)):
-            segment[j].pos = lerp(newLeftPos, newRightPos, unlerp(leftAt, rightAt, segment[j].at))
+        if leftAt == rightAt:
+            middlePos = lerp(newLeftPos, newRightPos, 0.5)
+            for e in segment:
+                e.pos = middlePos
+            continue
+        dat = rightAt - leftAt
+        for e in segment:
+            t = (e.at - leftAt) / dat
+            e.pos = newLeftPos * (1 - t) + newRightPos * t
 
     return connectSegments(segments)
 
 
+_STATS_CACHE_SIZE = 64
+_statsCache: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+
 def toStats(actions: List['FunAction'], options: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generates statistics for a funscript's actions
+    Results are memoized by action content, so re-rendering an unchanged script is cheap
     """
     durationSeconds = options['durationSeconds']
 
-    MaxSpeed = actionsRequiredMaxSpeed(actions)
-    AvgSpeed = actionsAverageSpeed(actions)
+    arrays = actionsToArrays(actions)
+    # the full tuples, not their hashes: a hash collision would hand back another script's stats
+    key = (durationSeconds, tuple(arrays[0]), tuple(arrays[1]))
+    stats = _statsCache.get(key)
+    if stats is not None:
+        return dict(stats)
 
-    return {
+    cache = _Cached(actions, arrays)
+    MaxSpeed = actionsRequiredMaxSpeed(actions, cache.peaks)
+    AvgSpeed = actionsAverageSpeed(actions, zigzag=cache.zigzag)
+
+    stats = {
         'Duration': secondsToDuration(durationSeconds),
-        'Actions': len([e for i, e in enumerate(actions) if isPeak(actions, i) != 0]),
+        'Actions': len(cache.zigzag),
         'MaxSpeed': round(MaxSpeed),
         'AvgSpeed': round(AvgSpeed),
     }
-    lines = []
-    from .misc import speedBetween
-
-    for i in range(1, len(actions)):
-        p = actions[i - 1]
-        e = actions[i]
-        line_speed = speedBetween(p, e)
-        line = ActionLine(p, e, abs(line_speed))
-        line.speed = line_speed
-        line.absSpeed = abs(line_speed)
-        line.speedSign = 1 if line_speed > 0 else -1 if line_speed < 0 else 0
-        line.dat = e.at - p.at
-        line.atStart = p.at
-        line.atEnd = e.at
-        lines.append(line)
-
-    return [e for e in lines if e[0].at < e[1].at]
+    _statsCache[key] = stats
+    if len(_statsCache) > _STATS_CACHE_SIZE:
+        del _statsCache[next(iter(_statsCache))]
+    # callers pop/modify the result, keep the cached one intact
+    return dict(stats)
@@ -1,47 +1,36 @@
 from typing import List, Optional, Callable, TypeVar, Any, Tuple, Dict, TYPE_CHECKING
+from functools import lru_cache
 import math
 
 if TYPE_CHECKING:
     from . import FunAction
     from .types import mantissaText, pos, speed
 
-try:
-    from colour.models import Oklab_to_XYZ, XYZ_to_sRGB
-    import numpy as np
+@lru_cache(maxsize=4096)
+def oklch2rgb(lightness: float, c: float, h: float) -> Tuple[int, int, int]:
+    # plain float math: going through colour/numpy costs an array round-trip per call,
+    # and callers ask for the same few colours repeatedly, so results are memoized
+    h_rad = h * math.pi / 180
+    a = c * math.cos(h_rad)
+    b = c * math.sin(h_rad)
 
-    def oklch2rgb(lightness: float, c: float, h: float) -> Tuple[int, int, int]:
-        h_rad = math.radians(h)
-        a = c * math.cos(h_rad)
-        b = c * math.sin(h_rad)
+    y = (lightness + 0.3963377774 * a + 0.2158037573 * b)
+    x = (lightness - 0.1055613458 * a - 0.0638541728 * b)
+    z = (lightness - 0.0894841775 * a - 1.2914855480 * b)
 
-        oklab = np.array([lightness, a, b])
-        xyz = Oklab_to_XYZ(oklab)
-        rgb = XYZ_to_sRGB(xyz)
+    r = 3.2404542 * x - 1.5371385 * y - 0.4985314 * z
+    g = -0.9692660 * x + 1.8760108 * y + 0.0415560 * z
+    b_val = 0.0556434 * x - 0.2040259 * y + 1.0572252 * z
 
-        r, g, b_val = [max(0, min(255, int(round(x * 255)))) for x in rgb]
-        return (r, g, b_val)
-except ImportError:
-    def oklch2rgb(lightness: float, c: float, h: float) -> Tuple[int, int, int]:
-        h_rad = h * math.pi / 180
-        a = c * math.cos(h_rad)
-        b = c * math.sin(h_rad)
+    return (_gammaCorrect(r), _gammaCorrect(g), _gammaCorrect(b_val))
 
-        y = (lightness + 0.3963377774 * a + 0.2158037573 * b)
-        x = (lightness - 0.1055613458 * a - 0.0638541728 * b)
-        z = (lightness - 0.0894841775 * a - 1.2914855480 * b)
 
-        r = 3.2404542 * x - 1.5371385 * y - 0.4985314 * z
-        g = -0.9692660 * x + 1.8760108 * y + 0.0415560 * z
-        b_val = 0.0556434 * x - 0.2040259 * y + 1.0572252 * z
-
-        def gamma_correct(c: float) -> int:
-            if c <= 0.0031308:
-                c = 12.92 * c
-            else:
-                c = 1.055 * (c ** (1/2.4)) - 0.055
-            return max(0, min(255, int(round(c * 255))))
-
-        return (gamma_correct(r), gamma_correct(g), gamma_correct(b_val))
+def _gammaCorrect(c: float) -> int:
+    if c <= 0.0031308:
+        c = 12.92 * c
+    else:
+        c = 1.055 * (c ** (1/2.4)) - 0.055
+    return max(0, min(255, int(round(c * 255))))
 
 
 def clamp(value: float, left: float, right: float) -> float:
@@ -65,7 +54,12 @@ def clamplerp(
     outMin: float,
     outMax: float,
 ) -> float:
-    return lerp(outMin, outMax, clamp(unlerp(inMin, inMax, value), 0, 1))
+    # lerp(outMin, outMax, clamp(unlerp(inMin, inMax, value), 0, 1)), inlined: this runs per sample
+    if inMin == inMax:
+        t = 0.5
+    else:
+        t = max(0, min(1, (value - inMin) / (inMax - inMin)))
+    return outMin * (1 - t) + outMax * t
 
 
 def listToSum(list: List[float]) -> float:
@@ -99,9 +93,40 @@ T = TypeVar('T')
 
 
 def minBy(list: List[T], fn: Callable[[T], float]) -> T:
-    values = [fn(item) for item in list]
-    min_index = min(range(len(values)), key=lambda i: values[i])
-    return list[min_index]
+    return min(list, key=fn)
+
+
+def makeComparator(order: List[Optional[str]]) -> Callable[[Optional[str], Optional[str]], int]:
+    """
+    compareWithOrder bound to a fixed order array, with indices looked up in a dict
+    Use with functools.cmp_to_key when sorting
+    """
+    N = len(order)
+    orderIndex: Dict[Optional[str], int] = {}
+    for i, value in enumerate(order):
+        # keep the first index, like list.index
+        orderIndex.setdefault(value, i)
+
+    def rank(value: Optional[str]) -> int:
+        index = orderIndex.get(value)
+        if index is not None:
+            return index
+        return N if value else (N + 1 if value == '' else N + 2)
+
+    def compare(a: Optional[str], b: Optional[str]) -> int:
+        aIndex = rank(a)
+        bIndex = rank(b)
+
+        if aIndex != bIndex:
+            return aIndex - bIndex
+
+        # both are strings
+        if aIndex == N:
+            return 0 if a == b else (-1 if a < b else 1)
+
+        return 0
+
+    return compare
 
 
 def compareWithOrder(a: Optional[str], b: Optional[str], order: List[Optional[str]]) -> int:
@@ -137,8 +162,8 @@ def toMantissa(value: 'pos', trim: bool = False) -> 'mantissaText':
 
     text = f"{clamp(value / 100, 0, 0.9999):.4f}"[2:]
     if trim:
-        import re
-        text = re.sub(r'(?<=.)0+$', '', text)
+        # drop trailing zeros but keep the first digit, same as /(?<=.)0+$/
+        text = text.rstrip('0') or text[:1]
     return MantissaTextType(text)
 
 
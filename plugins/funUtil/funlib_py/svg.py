@@ -1,18 +1,27 @@
-from typing import List, Optional, Dict, Any, Callable, Union, TYPE_CHECKING
-import random
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple, Union, TYPE_CHECKING
+from functools import lru_cache
+from itertools import count, cycle
+from operator import attrgetter, itemgetter
+import math
 
 if TYPE_CHECKING:
     from . import FunAction, Funscript
     from .types import ms
 
-from . import FunAction
 from .converter import channelNameToAxis, speedToHexCached
-from .manipulations import actionsToLines, actionsToZigzag, mergeLinesSpeed, toStats
+from .manipulations import actionsToArrays, arraysToLineSpeeds, mergeSpeedRuns, peaksMask, toStats
 from .misc import lerp
 
 
 class SvgOptions:
     """Configuration options for SVG rendering"""
+    __slots__ = (
+        'lineWidth', 'title', 'icon', 'font', 'iconFont', 'halo', 'solidTitleBackground',
+        'graphOpacity', 'titleOpacity', 'mergeLimit', 'normalize', 'titleEllipsis',
+        'titleSeparateLine', 'width', 'height', 'titleHeight', 'titleSpacing', 'iconWidth',
+        'iconSpacing', 'durationMs', 'showChapters', 'chapterHeight',
+    )
+
     def __init__(self, **kwargs):
         # rendering
         self.lineWidth: float = kwargs.get('lineWidth', 0.5)
@@ -40,6 +49,17 @@ class SvgOptions:
         self.showChapters: bool = kwargs.get('showChapters', False)
         self.chapterHeight: float = kwargs.get('chapterHeight', 10)
 
+    def merged(self, base: 'SvgOptions') -> 'SvgOptions':
+        """Copy of these options with unset (None) values taken from `base`"""
+        out = SvgOptions.__new__(SvgOptions)
+        for name, value, default in zip(SvgOptions.__slots__, _svgOptionValues(self), _svgOptionValues(base)):
+            setattr(out, name, value if value is not None else default)
+        return out
+
+
+# all SvgOptions slot values as a tuple in one call
+_svgOptionValues = attrgetter(*SvgOptions.__slots__)
+
 
 # y between one axis G and the next
 SPACING_BETWEEN_AXES = 0
@@ -85,6 +105,17 @@ def textToSvgLength(text: str, font: str) -> float:
     return 0
 
 
+# HTML entity mappings for characters that need escaping in SVG
+_SVG_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+    '/': '&#x2F;',
+})
+
+
 def textToSvgText(text: str) -> str:
     """
     Escapes text for safe usage in SVG by converting special characters to HTML entities.
@@ -92,21 +123,7 @@ def textToSvgText(text: str) -> str:
     """
     if not text:
         return text
-
-    # Define HTML entity mappings for characters that need escaping in SVG
-    entityMap = {
-        '&': '&amp;',
-        '<': '&lt;',
-        '>': '&gt;',
-        '"': '&quot;',
-        "'": '&#39;',
-        '/': '&#x2F;',
-    }
-
-    result = ''
-    for char in text:
-        result += entityMap.get(char, char)
-    return result
+    return text.translate(_SVG_ESCAPE_TABLE)
 
 
 def truncateTextWithEllipsis(text: str, maxWidth: float, font: str) -> str:
@@ -116,6 +133,9 @@ def truncateTextWithEllipsis(text: str, maxWidth: float, font: str) -> str:
     """
     if not text:
         return text
+    if not isBrowser:
+        # every text measures 0 here, so it either fits or nothing but the ellipsis does
+        return text if 0 <= maxWidth else '…'
     if textToSvgLength(text, font) <= maxWidth:
         return text
 
@@ -124,14 +144,101 @@ def truncateTextWithEllipsis(text: str, maxWidth: float, font: str) -> str:
     return text + '…'
 
 
+_PLAIN_NUMBER_TYPES = {int, float, bool}
+
+
+@lru_cache(maxsize=1024)
+def _timeToMs(timeStr: str) -> float:
+    """
+    'hh:mm:ss.fff' to milliseconds, cached since the same chapter times come back on every render
+    """
+    hours, _, rest = timeStr.partition(':')
+    minutes, _, seconds = rest.partition(':')
+    return (int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000
+
+
+def _chapterSpanMs(chapter: Any) -> Tuple[float, float]:
+    """
+    (startMs, endMs) of a chapter: its startAt/endAt, else the parsed startTime/endTime.
+    Chapters are FunChapter, so the properties are tried directly and AttributeError is the rare path
+    """
+    try:
+        startMs = chapter.startAt
+    except AttributeError:
+        startMs = None
+    try:
+        endMs = chapter.endAt
+    except AttributeError:
+        endMs = None
+    if not startMs:
+        startMs = _timeToMs(getattr(chapter, 'startTime', '0:0:0'))
+    if not endMs:
+        endMs = _timeToMs(getattr(chapter, 'endTime', '0:0:0'))
+    return startMs, endMs
+
+
+def _allFinite(values: List[Any]) -> bool:
+    """
+    True if every value is a finite int/float, checked with C-level map() passes.
+    False only means the caller should look closer (odd number types included)
+    """
+    if not set(map(type, values)) <= _PLAIN_NUMBER_TYPES:
+        return False
+    try:
+        return all(map(math.isfinite, values))
+    except OverflowError:
+        return False
+
+
+def _actionsNormalized(actions: List['FunAction']) -> bool:
+    """
+    True if Funscript.normalize would leave these actions unchanged:
+    int ats strictly increasing from >= 0, int positions within 0..100
+    """
+    ats, poss = actionsToArrays(actions)
+    if not set(map(type, ats)) <= {int} or not set(map(type, poss)) <= {int}:
+        return False
+    if ats and ats[0] < 0 or poss and not (0 <= min(poss) and max(poss) <= 100):
+        return False
+    return all(map(int.__lt__, ats, ats[1:]))
+
+
+def _normalizedView(script: 'Funscript') -> 'Funscript':
+    """
+    Same as script.clone().normalize() for rendering, but shares the action lists when they are already normalized.
+    Like clone(), the view gets fresh metadata: no chapters, and the duration taken from the actions
+    """
+    channels = script.channels
+    if script.parent or not _actionsNormalized(script.actions) or \
+            not all(_actionsNormalized(e.actions) for e in channels.values()):
+        return script.clone().normalize()
+
+    base = type(script)
+    view = base()
+    view.actions = script.actions
+    view.channel = script.channel or (script.file.channel if script.file else None)
+    view.file = script.file
+    for ch, e in channels.items():
+        channel = base.Channel(None, {'parent': view, 'channel': ch})
+        channel.actions = e.actions
+        channel.file = e.file
+        view.channels[ch] = channel
+
+    duration = int(view.actualDuration + 0.5)  # as in Funscript.normalize
+    for e in view.allChannels:
+        e.metadata.duration = duration
+    return view
+
+
 def toSvgLines(
     script: 'Funscript',
     ops: SvgOptions,
     ctx: Dict[str, float],
-) -> List[str]:
+) -> Iterator[str]:
     """
     Converts a Funscript to SVG path elements representing the motion lines.
     Each line is colored based on speed and positioned within the specified dimensions.
+    Paths are yielded one by one so callers can stream them into their output.
     """
     lineWidth = ops.lineWidth
     mergeLimit = ops.mergeLimit
@@ -139,25 +246,22 @@ def toSvgLines(
     width = ctx['width']
     height = ctx['height']
 
-    def round_val(x: float) -> float:
-        return round(x, 2)
-
-    def lineToStroke(a: 'FunAction', b: 'FunAction') -> str:
-        def at(action: 'FunAction') -> float:
-            return round_val((action.at / durationMs * (width - 2 * lineWidth)) + lineWidth)
-
-        def pos(action: 'FunAction') -> float:
-            return round_val((100 - action.pos) * (height - 2 * lineWidth) / 100 + lineWidth)
-
-        return f"M {at(a)} {pos(a)} L {at(b)} {pos(b)}"
+    # loop-invariant parts of the at/pos -> x/y mapping
+    xScale = width - 2 * lineWidth
+    yScale = height - 2 * lineWidth
 
-    lines = actionsToLines(script.actions)
-    mergeLinesSpeed(lines, mergeLimit)
+    ats, poss = actionsToArrays(script.actions)
+    ends, speeds, signs, dats = arraysToLineSpeeds(ats, poss)
+    for start, stop, avgSpeed in mergeSpeedRuns(speeds, signs, dats, mergeLimit):
+        speeds[start:stop] = [avgSpeed] * (stop - start)
 
-    lines.sort(key=lambda x: x[2])
     # global styles: stroke-width="${w}" fill="none" stroke-linecap="round"
-    return [f'<path d="{lineToStroke(a, b)}" stroke="{speedToHexCached(speed)}"></path>'
-            for a, b, speed in lines]
+    return (
+        f'<path d="M {round(ats[i - 1] / durationMs * xScale + lineWidth, 2)} {round((100 - poss[i - 1]) * yScale / 100 + lineWidth, 2)}'
+        f' L {round(ats[i] / durationMs * xScale + lineWidth, 2)} {round((100 - poss[i]) * yScale / 100 + lineWidth, 2)}"'
+        f' stroke="{speedToHexCached(speed)}"></path>'
+        for speed, i in sorted(zip(speeds, ends), key=itemgetter(0))
+    )
 
 
 def toSvgBackgroundGradient(
@@ -169,87 +273,98 @@ def toSvgBackgroundGradient(
     Creates an SVG linear gradient definition based on a Funscript's speed variations over time.
     The gradient represents speed changes throughout the script duration with color transitions.
     """
-    durationMs = ops.durationMs
+    out: List[str] = ['']
+    _appendSvgBackgroundGradient(out, script, ops, linearGradientId)
+    return '\n'.join(out)
 
-    def round_val(x: float) -> float:
-        return round(x, 2)
 
-    lines = []
-    for e in actionsToLines(actionsToZigzag(script.actions)):
-        a, b, s = e[0], e[1], e[2]
-        length = b.at - a.at
+def _gradientLines(actions: List['FunAction']) -> Iterator[Tuple[float, float, float]]:
+    """
+    Zigzag lines of `actions` as (atStart, atEnd, absSpeed), long lines split into ~1000ms pieces
+    """
+    ats, poss = actionsToArrays(actions)
+    peaks = peaksMask(ats, poss)
+    zats = [at for at, peak in zip(ats, peaks) if peak]
+    zposs = [pos for pos, peak in zip(poss, peaks) if peak]
+
+    for j in range(1, len(zats)):
+        aAt = zats[j - 1]
+        bAt = zats[j]
+        length = bAt - aAt
         if length <= 0:
             continue
+        s = abs((zposs[j] - zposs[j - 1]) / length * 1000)
         if length < 2000:
-            lines.append(e)
+            yield (aAt, bAt, s)
             continue
         # split into len/1000-1 periods
         N = int((length - 500) / 1000)
         for i in range(N):
-            new_a = FunAction({'at': lerp(a.at, b.at, i / N), 'pos': lerp(a.pos, b.pos, i / N)})
-            new_b = FunAction({'at': lerp(a.at, b.at, (i + 1) / N), 'pos': lerp(a.pos, b.pos, (i + 1) / N)})
-            lines.append([new_a, new_b, s])
-
-        # merge lines so they are at least 500 long
-    i = 0
-    while i < len(lines) - 1:
-        a, b, ab = lines[i][0], lines[i][1], lines[i][2]
-        c, d, cd = lines[i + 1][0], lines[i + 1][1], lines[i + 1][2]
-        if d.at - a.at < 1000:
-            speed = (ab * (b.at - a.at) + cd * (d.at - c.at)) / ((b.at - a.at) + (d.at - c.at))
-            lines[i:i + 2] = [[a, d, speed]]
-            i -= 1
-        i += 1
+            yield (lerp(aAt, bAt, i / N), lerp(aAt, bAt, (i + 1) / N), s)
 
-    stops = []
-    for i, e in enumerate(lines):
-        p = lines[i - 1] if i > 0 else None
-        n = lines[i + 1] if i < len(lines) - 1 else None
-        if not p or not n:
-            stops.append(e)
-            continue
-        if p[2] == e[2] == n[2]:
-            continue
-        stops.append(e)
 
-    stops = [{'at': (e[0].at + e[1].at) / 2, 'speed': e[2]} for e in stops]
+def _appendSvgBackgroundGradient(
+    out: List[str],
+    script: 'Funscript',
+    ops: SvgOptions,
+    linearGradientId: str,
+) -> None:
+    """
+    toSvgBackgroundGradient, appending its lines to `out` instead of building a string
+    """
+    durationMs = ops.durationMs
+
+    def round_val(x: float) -> float:
+        return round(x, 2)
 
-    # add start, first, last, end stops
+    # merge lines so they are at least 500 long, folding each piece in as it is produced
+    lines = []
+    for line in _gradientLines(script.actions):
+        if lines and line[1] - lines[-1][0] < 1000:
+            aAt, bAt, ab = lines[-1]
+            cAt, dAt, cd = line
+            lines[-1] = (aAt, dAt, (ab * (bAt - aAt) + cd * (dAt - cAt)) / ((bAt - aAt) + (dAt - cAt)))
+        else:
+            lines.append(line)
+
+    # (at, speed) stops: start/first sentinels, line middles where the speed changes, last/end sentinels
+    stops = []
     if lines:
         first = lines[0]
         last = lines[-1]
-        stops.insert(0, {'at': first[0].at, 'speed': first[2]})
-        if first[0].at > 100:
-            stops.insert(0, {'at': first[0].at - 100, 'speed': 0})
-        stops.append({'at': last[1].at, 'speed': last[2]})
-        if last[1].at < durationMs - 100:
-            stops.append({'at': last[1].at + 100, 'speed': 0})
-
-    # remove duplicates
-    filtered_stops = []
-    for i, e in enumerate(stops):
-        p = stops[i - 1] if i > 0 else None
-        n = stops[i + 1] if i < len(stops) - 1 else None
-        if not p or not n:
-            filtered_stops.append(e)
-            continue
-        if p['speed'] == e['speed'] == n['speed']:
+        if first[0] > 100:
+            stops.append((first[0] - 100, 0))
+        stops.append((first[0], first[2]))
+        lastIndex = len(lines) - 1
+        for i, e in enumerate(lines):
+            if 0 < i < lastIndex and lines[i - 1][2] == e[2] == lines[i + 1][2]:
+                continue
+            stops.append(((e[0] + e[1]) / 2, e[2]))
+        stops.append((last[1], last[2]))
+        if last[1] < durationMs - 100:
+            stops.append((last[1] + 100, 0))
+
+    out.append(f'      <linearGradient id="{linearGradientId}">')
+    # the first stop shares its line with the opening indent
+    indent = '                  '
+    lastIndex = len(stops) - 1
+    for i, (at, speed) in enumerate(stops):
+        # remove duplicates
+        if 0 < i < lastIndex and stops[i - 1][1] == speed == stops[i + 1][1]:
             continue
-        filtered_stops.append(e)
-    stops = filtered_stops
-
-    stop_elements = []
-    for s in stops:
-        offset = round_val(max(0, min(1, s['at'] / durationMs)))
-        opacity_attr = '' if s['speed'] >= 100 else f' stop-opacity="{round_val(s["speed"] / 100)}"'
-        stop_elements.append(
-            f'<stop offset="{offset}" stop-color="{speedToHexCached(s["speed"])}"{opacity_attr}></stop>'
+        offset = round_val(max(0, min(1, at / durationMs)))
+        opacity_attr = '' if speed >= 100 else f' stop-opacity="{round_val(speed / 100)}"'
+        out.append(
+            f'{indent}<stop offset="{offset}" stop-color="{speedToHexCached(speed)}"{opacity_attr}></stop>'
         )
+        indent = '          '
+    if not stops:
+        out.append('        ')
+    out.append('      </linearGradient>')
+
 
-    return f'''
-      <linearGradient id="{linearGradientId}">
-        {chr(10).join(f"          {s}" for s in stop_elements)}
-      </linearGradient>'''
+# ids only need to be unique within a document, a process-wide counter is enough
+_gradIds = count()
 
 
 def toSvgBackground(
@@ -267,11 +382,14 @@ def toSvgBackground(
     bgOpacity = ctx.get('bgOpacity', svgDefaultOptions.graphOpacity)
     rectId = ctx.get('rectId')
 
-    id_val = f"grad_{random.random():.16f}".replace('0.', '').replace('.', '')[:10]
+    id_val = f"grad{next(_gradIds):x}"
 
-    return f'''
-    <defs>{toSvgBackgroundGradient(script, ops, id_val)}</defs>
-    <rect{f' id="{rectId}"' if rectId else ''} width="{width}" height="{height}" fill="url(#{id_val})" opacity="{bgOpacity}"></rect>'''
+    out = ['', '    <defs>']
+    _appendSvgBackgroundGradient(out, script, ops, id_val)
+    out[-1] += '</defs>'
+    rectIdAttr = f' id="{rectId}"' if rectId else ''
+    out.append(f'    <rect{rectIdAttr} width="{width}" height="{height}" fill="url(#{id_val})" opacity="{bgOpacity}"></rect>')
+    return '\n'.join(out)
 
 
 def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions) -> str:
@@ -280,7 +398,7 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
     Each script and its axes are rendered as separate visual blocks with proper spacing.
     """
     scripts = [scripts] if not isinstance(scripts, list) else scripts
-    fullOps = SvgOptions(**{**vars(svgDefaultOptions), **{k: v for k, v in vars(ops).items() if v is not None}})
+    fullOps = ops.merged(svgDefaultOptions)
     fullOps.width -= SVG_PADDING * 2
 
     def round_val(x: float) -> float:
@@ -299,7 +417,8 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
     # Chapters at top for full heatmaps (with title), at bottom for overlays (no title)
     chaptersAtTop = fullOps.titleHeight > 0
 
-    pieces = []
+    # lines of every script/axis group, joined once at the end
+    pieces: List[str] = []
     y = SVG_PADDING + (chapterOffset if chaptersAtTop else 0)
 
     title_extra_height = [0]  # Use list to allow modification in closure
@@ -309,25 +428,25 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
 
     for s in scripts:
         if fullOps.normalize:
-            s = s.clone().normalize()
+            s = _normalizedView(s)
         durationMs = fullOps.durationMs or s.actualDuration * 1000
         fullOps.durationMs = durationMs
         # Only show title for the first script
-        pieces.append(toSvgG(s, fullOps, {
+        _appendSvgG(pieces, s, fullOps, {
             'transform': f"translate({SVG_PADDING}, {y})",
             'onDoubleTitle': onDoubleTitle,
-        }))
+        })
         y += fullOps.height + title_extra_height[0] + SPACING_BETWEEN_AXES
         title_extra_height[0] = 0
         
         # Only render secondary axes for full heatmaps (overlays should only show L0)
         if fullOps.titleHeight > 0:
             for a in s.listChannels:
-                pieces.append(toSvgG(a, fullOps, {
+                _appendSvgG(pieces, a, fullOps, {
                     'transform': f"translate({SVG_PADDING}, {y})",
                     'isSecondaryAxis': True,
                     'onDoubleTitle': onDoubleTitle,
-                }))
+                })
                 y += fullOps.height + title_extra_height[0] + SPACING_BETWEEN_AXES
                 title_extra_height[0] = 0
         y += SPACING_BETWEEN_FUNSCRIPTS - SPACING_BETWEEN_AXES
@@ -340,10 +459,10 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
     else:
         # For overlays, place chapters below the heatmap content
         chapterYPosition = y    # Generate chapter bar if enabled
-    chapterSvg = ''
+    chapterLines: List[str] = []
     if hasChapters:
         # Randomly chosen colors, could probably be changed to reflect average speeds or something similar
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E2']
+        colors = cycle(('#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E2'))
         durationMs = fullOps.durationMs or firstScript.actualDuration * 1000
         chapterY = chapterYPosition
         graphWidth = fullOps.width - fullOps.iconWidth - (fullOps.iconSpacing if fullOps.iconWidth > 0 else 0)
@@ -353,23 +472,19 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
         textHalos = []
         textElements = []
 
-        # Helper function to convert time string to milliseconds
-        def timeToMs(timeStr: str) -> float:
-            parts = timeStr.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds = float(parts[2])
-            return (hours * 3600 + minutes * 60 + seconds) * 1000
+        # chapter text differs only in x and name
+        textY = round_val(chapterY + fullOps.chapterHeight / 2 + 3)
+        fontSize = round_val(fullOps.chapterHeight * 0.7)
+        textAttrs = f'y="{textY}" font-size="{fontSize}px" font-family="{fullOps.font}" text-anchor="middle" font-weight="bold"'
 
         # Build chapter elements
-        for idx, chapter in enumerate(firstScript.metadata.chapters):
-            startMs = getattr(chapter, 'startAt', None) or timeToMs(getattr(chapter, 'startTime', '0:0:0'))
-            endMs = getattr(chapter, 'endAt', None) or timeToMs(getattr(chapter, 'endTime', '0:0:0'))
+        for chapter in firstScript.metadata.chapters:
+            startMs, endMs = _chapterSpanMs(chapter)
 
             startX = (startMs / durationMs) * graphWidth + xOffset
             endX = (endMs / durationMs) * graphWidth + xOffset
             chapterWidth = endX - startX
-            color = colors[idx % len(colors)]
+            color = next(colors)
 
             chapterRects.append(
                 f'    <rect x="{round_val(startX)}" y="{chapterY}" width="{round_val(chapterWidth)}" height="{fullOps.chapterHeight}" fill="{color}" opacity="0.8" rx="2" ry="2"/>'
@@ -377,39 +492,33 @@ def toSvgElement(scripts: Union['Funscript', List['Funscript']], ops: SvgOptions
 
             # Only render chapter name text if the chapter is wide enough
             if chapterWidth > 30:
-                textX = round_val(startX + chapterWidth / 2)
-                textY = round_val(chapterY + fullOps.chapterHeight / 2 + 3)
-                fontSize = round_val(fullOps.chapterHeight * 0.7)
-
-                textHalos.append(
-                    f'      <text x="{textX}" y="{textY}" font-size="{fontSize}px" font-family="{fullOps.font}" text-anchor="middle" font-weight="bold">{textToSvgText(chapter.name)}</text>'
-                )
-                textElements.append(
-                    f'    <text x="{textX}" y="{textY}" font-size="{fontSize}px" font-family="{fullOps.font}" text-anchor="middle" font-weight="bold">{textToSvgText(chapter.name)}</text>'
-                )
-
-        halo_group = ''
+                text = f'<text x="{round_val(startX + chapterWidth / 2)}" {textAttrs}>{textToSvgText(chapter.name)}</text>'
+                textHalos.append(f'      {text}')
+                textElements.append(f'    {text}')
+
+        chapterLines.append('  <g id="chapters">')
+        chapterLines.extend(chapterRects)
         if textHalos:
-            halo_group = f'''    <g stroke="white" opacity="0.5" paint-order="stroke fill markers" stroke-width="3" stroke-dasharray="none" stroke-linejoin="round" fill="transparent">
-{chr(10).join(textHalos)}
-    </g>
-'''
-
-        chapterSvg = f'''  <g id="chapters">
-{chr(10).join(chapterRects)}
-{halo_group}{chr(10).join(textElements)}
-  </g>
-'''
+            chapterLines.append('    <g stroke="white" opacity="0.5" paint-order="stroke fill markers" stroke-width="3" stroke-dasharray="none" stroke-linejoin="round" fill="transparent">')
+            chapterLines.extend(textHalos)
+            chapterLines.append('    </g>')
+            chapterLines.extend(textElements)
+        else:
+            chapterLines.append('')
+        chapterLines.append('  </g>')
         
         # Add chapter height to total SVG height only if chapters exist and are at bottom
         if hasChapters and not chaptersAtTop:
             y += chapterOffset
 
-    return f'''<svg class="funsvg" width="{round_val(fullOps.width)}" height="{round_val(y)}" xmlns="http://www.w3.org/2000/svg"
-    font-size="{round_val(fullOps.titleHeight * 0.8)}px" font-family="{fullOps.font}"
->
-{chapterSvg}{chr(10).join(pieces)}
-</svg>'''
+    return '\n'.join([
+        f'<svg class="funsvg" width="{round_val(fullOps.width)}" height="{round_val(y)}" xmlns="http://www.w3.org/2000/svg"',
+        f'    font-size="{round_val(fullOps.titleHeight * 0.8)}px" font-family="{fullOps.font}"',
+        '>',
+        *chapterLines,
+        *pieces,
+        '</svg>',
+    ])
 
 
 def toSvgG(
@@ -422,6 +531,20 @@ def toSvgG(
     Includes background, graph lines, titles, statistics, axis labels, and borders.
     This is the core rendering function for individual script visualization.
     """
+    out: List[str] = []
+    _appendSvgG(out, script, ops, ctx)
+    return '\n'.join(out)
+
+
+def _appendSvgG(
+    out: List[str],
+    script: 'Funscript',
+    ops: SvgOptions,
+    ctx: Dict[str, Any],
+) -> None:
+    """
+    toSvgG, appending its lines to `out` instead of building a string
+    """
     title = ops.title
     icon = ops.icon
     w = ops.lineWidth
@@ -479,50 +602,45 @@ def toSvgG(
     statLabelFontSize = round_val(titleHeight * 0.4)
     statValueFontSize = round_val(titleHeight * 0.72)
 
-    useSeparateLine = [False]  # Use list to allow modification
-
-    # Define x positions for key SVG elements
-    class XX:
-        iconStart = 0  # Start of axis area
-        iconEnd = iconWidth  # End of axis area
-        titleStart = iconWidth + iconSpacing  # Start of title/graph area
-        svgEnd = width  # End of SVG
-        graphWidth = width - iconWidth - iconSpacing  # Width of graph area
+    useSeparateLine = False
 
-        @staticmethod
-        def statText(i: int) -> float:
-            return round_val(width - (7 + i * 46) * (titleHeight / 20))
+    # x positions of key SVG elements
+    titleStart = iconWidth + iconSpacing  # Start of title/graph area
+    graphWidth = width - iconWidth - iconSpacing  # Width of graph area
+    iconTextX = round_val(iconWidth / 2)
+    titleTextX = round_val(titleStart + titleHeight * 0.2)
 
-        @staticmethod
-        def iconText() -> float:
-            return round_val(XX.iconEnd / 2)
+    def statTextX(i: int) -> float:
+        return round_val(width - (7 + i * 46) * (titleHeight / 20))
 
-        @staticmethod
-        def titleText() -> float:
-            return round_val(XX.titleStart + titleHeight * 0.2)
+    def textWidth() -> float:
+        return statTextX(0 if useSeparateLine else statCount) - titleTextX
 
-        @staticmethod
-        def textWidth() -> float:
-            return XX.statText(0 if useSeparateLine[0] else statCount) - XX.titleText()
+    # stats are listed right to left, share the order and x positions between halo and text
+    statsReversed = list(reversed(stats.items()))
+    statXs = tuple(statTextX(i) for i in range(statCount))
 
-    xx = XX()
+    # measured once; outside the browser every text measures 0, so this only
+    # kicks in when the stats leave no room at all (negative width)
+    titleFont = f"{proportionalFontSize}px {font}"
+    titleWidth = textToSvgLength(titleText, titleFont) if titleText else 0
 
-    if (titleText and titleSeparateLine is not False and
-        textToSvgLength(titleText, f"{proportionalFontSize}px {font}") > xx.textWidth()):
-        useSeparateLine[0] = True
+    if titleText and titleSeparateLine is not False and titleWidth > textWidth():
+        useSeparateLine = True
 
-    if (titleText and titleEllipsis and
-        textToSvgLength(titleText, f"{proportionalFontSize}px {font}") > xx.textWidth()):
-        titleText = truncateTextWithEllipsis(titleText, xx.textWidth(), f"{proportionalFontSize}px {font}")
+    if titleText and titleEllipsis and titleWidth > textWidth():
+        titleText = truncateTextWithEllipsis(titleText, textWidth(), titleFont)
 
-    if useSeparateLine[0]:
+    if useSeparateLine:
         ctx['onDoubleTitle']()
 
     # Calculate the actual graph height from total height
     graphHeight = height - titleHeight - titleSpacing
 
     # Warn if encountered NaN actions
-    badActions = [e for e in script.actions if not (isinstance(e.pos, (int, float)) and -float('inf') < e.pos < float('inf'))]
+    badActions = []
+    if not _allFinite([e.pos for e in script.actions]):
+        badActions = [e for e in script.actions if not (isinstance(e.pos, (int, float)) and -float('inf') < e.pos < float('inf'))]
     if badActions:
         print('badActions', badActions)
         for e in badActions:
@@ -530,109 +648,82 @@ def toSvgG(
         titleText += '::bad'
         iconText = '!!!'
 
-    # Define y positions for key SVG elements
-    class YY:
-        top = 0  # Top of SVG
-
-        @staticmethod
-        def titleExtra() -> float:
-            return titleHeight if useSeparateLine[0] else 0
-
-        @staticmethod
-        def titleBottom() -> float:
-            return round_val(titleHeight + YY.titleExtra())
-
-        @staticmethod
-        def graphTop() -> float:
-            return round_val(YY.titleBottom() + titleSpacing)
-
-        @staticmethod
-        def svgBottom() -> float:
-            return round_val(height + YY.titleExtra())
-
-        @staticmethod
-        def iconText() -> float:
-            return round_val((YY.top + YY.svgBottom()) / 2 + 4 + YY.titleExtra() / 2)
-
-        titleText = round_val(titleHeight * 0.75)
-
-        @staticmethod
-        def statLabelText() -> float:
-            return round_val(titleHeight * 0.35 + YY.titleExtra())
-
-        @staticmethod
-        def statValueText() -> float:
-            return round_val(titleHeight * 0.92 + YY.titleExtra())
-
-    yy = YY()
+    # y positions of key SVG elements
+    titleExtra = titleHeight if useSeparateLine else 0
+    titleBottom = round_val(titleHeight + titleExtra)
+    graphTop = round_val(titleBottom + titleSpacing)
+    svgBottom = round_val(height + titleExtra)
+    iconTextY = round_val(svgBottom / 2 + 4 + titleExtra / 2)
+    titleTextY = round_val(titleHeight * 0.75)
+    statLabelY = round_val(titleHeight * 0.35 + titleExtra)
+    statValueY = round_val(titleHeight * 0.92 + titleExtra)
 
     bgGradientId = f"funsvg-grad-{script.channel or ''}-{len(script.actions)}-{script.actions[0].at if script.actions else 0}"
 
     iconColor = speedToHexCached(stats.get('AvgSpeed', 0))
     iconOpacity = round_val(titleOpacity * max(0.5, min(1, stats.get('AvgSpeed', 0) / 100)))
 
-    lines_list = [
+    out.extend([
         f'<g transform="{ctx["transform"]}">',
         '  <g class="funsvg-bgs">',
-        f'    <defs>{toSvgBackgroundGradient(script, ops, bgGradientId)}</defs>',
-    ]
+        '    <defs>',
+    ])
+    _appendSvgBackgroundGradient(out, script, ops, bgGradientId)
+    out[-1] += '</defs>'
 
     if iconWidth > 0:
-        lines_list.append(f'    <rect class="funsvg-bg-axis-drop" x="0" y="{yy.top}" width="{xx.iconEnd}" height="{yy.svgBottom() - yy.top}" fill="#ccc" opacity="{round_val(graphOpacity * 1.5)}"></rect>')
+        out.append(f'    <rect class="funsvg-bg-axis-drop" x="0" y="0" width="{iconWidth}" height="{svgBottom}" fill="#ccc" opacity="{round_val(graphOpacity * 1.5)}"></rect>')
 
-    lines_list.extend([
-        f'    <rect class="funsvg-bg-title-drop" x="{xx.titleStart}" width="{xx.graphWidth}" height="{yy.titleBottom()}" fill="#ccc" opacity="{round_val(graphOpacity * 1.5)}"></rect>',
+    out.extend([
+        f'    <rect class="funsvg-bg-title-drop" x="{titleStart}" width="{graphWidth}" height="{titleBottom}" fill="#ccc" opacity="{round_val(graphOpacity * 1.5)}"></rect>',
     ])
 
     if iconWidth > 0:
-        lines_list.append(f'    <rect class="funsvg-bg-axis" x="0" y="{yy.top}" width="{xx.iconEnd}" height="{yy.svgBottom() - yy.top}" fill="{iconColor}" opacity="{iconOpacity}"></rect>')
+        out.append(f'    <rect class="funsvg-bg-axis" x="0" y="0" width="{iconWidth}" height="{svgBottom}" fill="{iconColor}" opacity="{iconOpacity}"></rect>')
 
     titleFill = iconColor if solidTitleBackground else f'url(#{bgGradientId})'
     titleOp = round_val(iconOpacity if solidTitleBackground else titleOpacity)
 
-    lines_list.extend([
-        f'    <rect class="funsvg-bg-title" x="{xx.titleStart}" width="{xx.graphWidth}" height="{yy.titleBottom()}" fill="{titleFill}" opacity="{titleOp}"></rect>',
-        f'    <rect class="funsvg-bg-graph" x="{xx.titleStart}" width="{xx.graphWidth}" y="{yy.graphTop()}" height="{graphHeight}" fill="url(#{bgGradientId})" opacity="{round_val(graphOpacity)}"></rect>',
+    out.extend([
+        f'    <rect class="funsvg-bg-title" x="{titleStart}" width="{graphWidth}" height="{titleBottom}" fill="{titleFill}" opacity="{titleOp}"></rect>',
+        f'    <rect class="funsvg-bg-graph" x="{titleStart}" width="{graphWidth}" y="{graphTop}" height="{graphHeight}" fill="url(#{bgGradientId})" opacity="{round_val(graphOpacity)}"></rect>',
         '  </g>',
         '',
-        f'  <g class="funsvg-lines" transform="translate({xx.titleStart}, {yy.graphTop()})" stroke-width="{w}" fill="none" stroke-linecap="round">',
+        f'  <g class="funsvg-lines" transform="translate({titleStart}, {graphTop})" stroke-width="{w}" fill="none" stroke-linecap="round">',
     ])
 
-    for line in toSvgLines(script, ops, {'width': xx.graphWidth, 'height': graphHeight}):
-        lines_list.append(f'    {line}')
+    out.extend(f'    {line}' for line in toSvgLines(script, ops, {'width': graphWidth, 'height': graphHeight}))
 
-    lines_list.extend([
+    out.extend([
         '  </g>',
         '',
         '  <g class="funsvg-titles">',
     ])
 
     if ops.halo:
-        lines_list.append('    <g class="funsvg-titles-halo" stroke="white" opacity="0.5" paint-order="stroke fill markers" stroke-width="3" stroke-dasharray="none" stroke-linejoin="round" fill="transparent">')
-        lines_list.append(f'      <text class="funsvg-title-halo" x="{xx.titleText()}" y="{yy.titleText}"> {textToSvgText(titleText)} </text>')
+        out.append('    <g class="funsvg-titles-halo" stroke="white" opacity="0.5" paint-order="stroke fill markers" stroke-width="3" stroke-dasharray="none" stroke-linejoin="round" fill="transparent">')
+        out.append(f'      <text class="funsvg-title-halo" x="{titleTextX}" y="{titleTextY}"> {textToSvgText(titleText)} </text>')
 
-        for i, (k, v) in enumerate(reversed(list(stats.items()))):
-            lines_list.append(f'      <text class="funsvg-stat-label-halo" x="{xx.statText(i)}" y="{yy.statLabelText()}" font-weight="bold" font-size="{statLabelFontSize}px" text-anchor="end"> {k} </text>')
-            lines_list.append(f'      <text class="funsvg-stat-value-halo" x="{xx.statText(i)}" y="{yy.statValueText()}" font-weight="bold" font-size="{statValueFontSize}px" text-anchor="end"> {v} </text>')
+        for i, (k, v) in enumerate(statsReversed):
+            out.append(f'      <text class="funsvg-stat-label-halo" x="{statXs[i]}" y="{statLabelY}" font-weight="bold" font-size="{statLabelFontSize}px" text-anchor="end"> {k} </text>')
+            out.append(f'      <text class="funsvg-stat-value-halo" x="{statXs[i]}" y="{statValueY}" font-weight="bold" font-size="{statValueFontSize}px" text-anchor="end"> {v} </text>')
 
-        lines_list.append('    </g>')
+        out.append('    </g>')
 
     if iconWidth > 0:
-        lines_list.append(f'    <text class="funsvg-axis" x="{xx.iconText()}" y="{yy.iconText()}" font-size="{round_val(max(12, iconWidth * 0.75))}px" font-family="{iconFont}" text-anchor="middle" dominant-baseline="middle"> {textToSvgText(iconText)} </text>')
+        out.append(f'    <text class="funsvg-axis" x="{iconTextX}" y="{iconTextY}" font-size="{round_val(max(12, iconWidth * 0.75))}px" font-family="{iconFont}" text-anchor="middle" dominant-baseline="middle"> {textToSvgText(iconText)} </text>')
 
-    lines_list.append(f'    <text class="funsvg-title" x="{xx.titleText()}" y="{yy.titleText}"> {textToSvgText(titleText)} </text>')
+    out.append(f'    <text class="funsvg-title" x="{titleTextX}" y="{titleTextY}"> {textToSvgText(titleText)} </text>')
 
-    for i, (k, v) in enumerate(reversed(list(stats.items()))):
-        lines_list.append(f'    <text class="funsvg-stat-label" x="{xx.statText(i)}" y="{yy.statLabelText()}" font-weight="bold" font-size="{statLabelFontSize}px" text-anchor="end"> {k} </text>')
-        lines_list.append(f'    <text class="funsvg-stat-value" x="{xx.statText(i)}" y="{yy.statValueText()}" font-weight="bold" font-size="{statValueFontSize}px" text-anchor="end"> {v} </text>')
+    for i, (k, v) in enumerate(statsReversed):
+        out.append(f'    <text class="funsvg-stat-label" x="{statXs[i]}" y="{statLabelY}" font-weight="bold" font-size="{statLabelFontSize}px" text-anchor="end"> {k} </text>')
+        out.append(f'    <text class="funsvg-stat-value" x="{statXs[i]}" y="{statValueY}" font-weight="bold" font-size="{statValueFontSize}px" text-anchor="end"> {v} </text>')
 
-    lines_list.extend([
+    out.extend([
         '  </g>',
         '</g>',
     ])
 
-    return '\n'.join(lines_list)
-
 
 def toSvgBlobUrl(script: Union['Funscript', List['Funscript']], ops: SvgOptions) -> str:
     """
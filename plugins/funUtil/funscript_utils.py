@@ -5,9 +5,19 @@ Import this module to avoid code duplication.
 """
 
 import json
+import logging
 import os
+import re
 import sys
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 AXIS_EXTENSIONS = [
     "stroke", "L0", "surge", "L1", "sway",
@@ -31,19 +41,104 @@ AXIS_MAPPING = {
     "lube": "lube", "A2": "lube"
 }
 
+_logger = logging.getLogger(__name__)
+
+# keys merge_funscripts picks the main script from, in order
+MAIN_AXIS_PRIORITY = ('stroke', 'L0', 'main')
+
+# threads used to check scenes for funscripts in query_interactive_scenes
+SCAN_WORKERS = 32
+# threads used by unmerge_funscript to write the per-channel files
+UNMERGE_WORKERS = 6
+# scenes fetched per GraphQL request in query_interactive_scenes
+SCENES_PAGE_SIZE = 500
+
+
+# macOS volumes are usually case-insensitive, but normcase leaves names untouched
+# there and some volumes are case-sensitive: names are folded for lookups and
+# every hit is confirmed with os.path.exists, which is what the filesystem says
+_FOLD_CASE = sys.platform == 'darwin'
+
+# a listing is only cached once its directory's mtime is this old, changes made
+# within one mtime tick (FAT, SMB shares, NTFS) would otherwise go unnoticed
+_LISTING_SETTLE_NS = 2_000_000_000
+
+
+def name_key(name: str) -> str:
+    """Case key of a file name, as stored in the scan_dir lookup set."""
+    return name.casefold() if _FOLD_CASE else os.path.normcase(name)
+
+
+def scan_dir(directory: str) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """
+    Read a directory once with os.scandir, uncached.
+
+    Returns:
+        Tuple of (entry names, name_key of each name for lookups with has_entry);
+        both empty if the directory is missing or unreadable
+    """
+    try:
+        with os.scandir(directory or '.') as it:
+            names = tuple(e.name for e in it)
+    except OSError:
+        return (), frozenset()
+    return names, frozenset(name_key(name) for name in names)
+
+
+def has_entry(keys: FrozenSet[str], directory: str, filename: str) -> bool:
+    """Whether a scan_dir lookup set of directory contains filename."""
+    if name_key(filename) not in keys:
+        return False
+    return not _FOLD_CASE or os.path.exists(os.path.join(directory, filename))
 
-def find_funscript_paths(base_path: str) -> Dict[str, str]:
-    """Find all funscript file paths for a given base path."""
+
+@lru_cache(maxsize=4096)
+def _scan_dir_cached(directory: str, mtime_ns: int) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """scan_dir keyed by mtime, so adding or removing files invalidates the entry."""
+    return scan_dir(directory)
+
+
+def _list_dir(directory: str, cached: bool = True) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """
+    scan_dir of a directory, from the cache when `cached` and the directory has
+    not changed in the last _LISTING_SETTLE_NS (one stat() per call).
+    """
+    if not cached:
+        return scan_dir(directory)
+    try:
+        mtime_ns = os.stat(directory or '.').st_mtime_ns
+    except OSError:
+        return (), frozenset()
+    if time.time_ns() - mtime_ns < _LISTING_SETTLE_NS:
+        # recently modified, a later change could keep this same mtime
+        return scan_dir(directory)
+    return _scan_dir_cached(directory or '.', mtime_ns)
+
+
+# (axis, ".<axis>.funscript") for find_funscript_paths
+_AXIS_SUFFIXES = tuple((ext, f".{ext}.funscript") for ext in AXIS_EXTENSIONS)
+
+
+def find_funscript_paths(base_path: str, cached: bool = True) -> Dict[str, str]:
+    """
+    Find all funscript file paths for a given base path.
+
+    Pass cached=False after changing files in the directory, so the listing is
+    read again instead of coming from the _list_dir cache.
+    """
     scripts = {}
 
-    main_path = f"{base_path}.funscript"
-    if os.path.exists(main_path):
-        scripts["main"] = main_path
+    directory, stem = os.path.split(base_path)
+    _, keys = _list_dir(directory, cached)
+    if not keys:
+        return scripts
 
-    for ext in AXIS_EXTENSIONS:
-        axis_path = f"{base_path}.{ext}.funscript"
-        if os.path.exists(axis_path):
-            scripts[ext] = axis_path
+    if has_entry(keys, directory, f"{stem}.funscript"):
+        scripts["main"] = f"{base_path}.funscript"
+
+    for ext, suffix in _AXIS_SUFFIXES:
+        if has_entry(keys, directory, stem + suffix):
+            scripts[ext] = base_path + suffix
 
     return scripts
 
@@ -52,8 +147,6 @@ def deduplicate_axis_scripts(scripts: Dict[str, str]) -> tuple:
     """
     Deduplicate axis scripts that map to the same canonical channel.
     """
-    import re
-
     canonical_groups = {}
     passthrough = {}
 
@@ -89,11 +182,71 @@ def deduplicate_axis_scripts(scripts: Dict[str, str]) -> tuple:
     return deduped, duplicates
 
 
+def _load_json_bytes(buf: bytes):
+    """Parse JSON bytes, with orjson when available."""
+    if orjson:
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and other stdlib-only extensions
+            pass
+    return json.loads(buf.decode('utf-8'))
+
+
 def read_funscript_json(file_path: str) -> Optional[Dict]:
     """Read and parse funscript JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _load_json_bytes(f.read())
+    except Exception:
+        return None
+
+
+_ACTIONS_KEY = b'"actions"'
+_JSON_SPACE = b' \t\r\n'
+
+
+def _strip_actions(buf: bytes) -> bytes:
+    """
+    Empty every "actions" array in raw funscript JSON whose body is only numbers
+    and "at"/"pos" keys, using C-level find/count instead of parsing the points.
+    Arrays holding anything else (other strings, nested arrays) are left as they are.
+    """
+    parts = []
+    pos = 0
+    while True:
+        key = buf.find(_ACTIONS_KEY, pos)
+        if key < 0:
+            break
+        after_key = key + len(_ACTIONS_KEY)
+        start = buf.find(b'[', after_key)
+        end = buf.find(b']', start + 1) if start >= 0 else -1
+        if end < 0:
+            break
+        # a real key follows '{' or ',' (so its quote is not escaped) and is followed by ':'
+        before = buf[max(0, key - 64):key].rstrip(_JSON_SPACE)[-1:]
+        if before in (b'{', b',') and buf[after_key:start].strip(_JSON_SPACE) == b':':
+            body = buf[start + 1:end]
+            if b'[' not in body and body.count(b'"') == 2 * (body.count(b'"at"') + body.count(b'"pos"')):
+                parts.append(buf[pos:start + 1])
+                pos = end
+                continue
+        parts.append(buf[pos:after_key])
+        pos = after_key
+    parts.append(buf[pos:])
+    return b''.join(parts)
+
+
+def read_funscript_header(file_path: str) -> Optional[Dict]:
+    """
+    Read a funscript with its actions arrays left empty.
+
+    Enough for get_funscript_version, is_merged_funscript and get_merged_channels,
+    without decoding the action points. Use read_funscript_json for the actions.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return _load_json_bytes(_strip_actions(f.read()))
     except Exception:
         return None
 
@@ -110,32 +263,41 @@ def get_funscript_version(funscript_data: Dict) -> str:
     if not funscript_data:
         return '1.0'
 
-    version = funscript_data.get('version', '1.0')
-
     # v2.0 with channels
-    if version == '2.0' and 'channels' in funscript_data:
-        channels = funscript_data.get('channels', {})
-        if isinstance(channels, dict) and len(channels) > 0:
+    if funscript_data.get('version') == '2.0':
+        channels = funscript_data.get('channels')
+        if isinstance(channels, dict) and channels:
             return '2.0'
 
     # v1.1 with axes array
-    if 'axes' in funscript_data:
-        axes = funscript_data.get('axes', [])
-        if isinstance(axes, list) and len(axes) > 0:
-            return '1.1'
+    axes = funscript_data.get('axes')
+    if isinstance(axes, list) and axes:
+        return '1.1'
 
     # v1.1 with metadata containing other axes (legacy check)
-    if 'metadata' in funscript_data:
-        metadata = funscript_data.get('metadata', {})
-        if isinstance(metadata, dict):
-            for key in metadata:
-                if (isinstance(metadata[key], dict) and
-                        'actions' in metadata[key]):
-                    return '1.1'
+    if _has_legacy_metadata_axes(funscript_data):
+        return '1.1'
 
     return '1.0'
 
 
+def _has_legacy_metadata_axes(funscript_data: Dict) -> bool:
+    """Legacy v1.1: other axes stored as {'actions': [...]} values inside metadata."""
+    metadata = funscript_data.get('metadata')
+    return isinstance(metadata, dict) and any(
+        isinstance(value, dict) and 'actions' in value for value in metadata.values())
+
+
+def peek_funscript_version(file_path: str) -> Optional[str]:
+    """
+    get_funscript_version of a file read with read_funscript_header.
+
+    Returns None if the file cannot be read or is empty, like a falsy read_funscript_json.
+    """
+    header = read_funscript_header(file_path)
+    return get_funscript_version(header) if header else None
+
+
 def is_merged_funscript(funscript_data: Dict) -> bool:
     """
     Check if funscript contains multiple axes (merged format).
@@ -148,40 +310,74 @@ def is_merged_funscript(funscript_data: Dict) -> bool:
     Returns:
         True if multi-axis merged format, False otherwise
     """
-    version = get_funscript_version(funscript_data)
-    return version in ('1.1', '2.0')
+    if not funscript_data:
+        return False
+
+    # same checks as get_funscript_version without building the version string,
+    # channels first since single-axis scripts rarely have the key at all
+    channels = funscript_data.get('channels')
+    if isinstance(channels, dict) and channels and funscript_data.get('version') == '2.0':
+        return True
+
+    axes = funscript_data.get('axes')
+    if isinstance(axes, list) and axes:
+        return True
 
+    return _has_legacy_metadata_axes(funscript_data)
 
-def merge_funscripts_v20(scripts: Dict[str, Dict]) -> Dict:
-    """Merge multiple funscripts into v2.0 format."""
+
+def merge_funscripts_v20(scripts: Dict[str, Dict], share_refs: bool = True) -> Dict:
+    """
+    Merge multiple funscripts into v2.0 format.
+
+    With share_refs (the default) the result reuses the input action lists and
+    main metadata instead of copying them, which is all a write-out needs.
+    Pass share_refs=False when the result will be modified afterwards.
+    """
     main_script = scripts.get("main")
     if not main_script:
         main_script = (
             scripts.get("stroke") or scripts.get("L0") or
-            list(scripts.values())[0]
+            next(iter(scripts.values()))
         )
 
-    merged = {
+    copy = (lambda value: value) if share_refs else _shallow_copy
+    return {
         "version": "2.0",
-        "actions": main_script.get('actions', []),
-        "metadata": main_script.get('metadata', {}),
-        "channels": {}
+        "actions": copy(main_script.get('actions', [])),
+        "metadata": copy(main_script.get('metadata', {})),
+        "channels": {
+            AXIS_MAPPING.get(axis_name, axis_name): {"actions": copy(script.get('actions', []))}
+            for axis_name, script in scripts.items()
+            if axis_name != "main"
+        }
     }
 
-    for axis_name, script in scripts.items():
-        if axis_name == "main":
-            continue
-        channel_name = AXIS_MAPPING.get(axis_name, axis_name)
-        merged["channels"][channel_name] = {
-            "actions": script.get('actions', [])
-        }
 
-    return merged
+def _shallow_copy(value):
+    """Copy of a list or dict one level deep, anything else as is."""
+    return value.copy() if isinstance(value, (list, dict)) else value
+
+
+_Funscript = None
+
+
+def _funscript_class():
+    """funlib_py's Funscript, putting this directory on sys.path and importing it on first use."""
+    global _Funscript
+    if _Funscript is None:
+        plugin_dir = os.path.dirname(__file__)
+        if plugin_dir not in sys.path:
+            sys.path.insert(0, plugin_dir)
+        from funlib_py import Funscript
+        _Funscript = Funscript
+    return _Funscript
 
 
 def convert_funscript_format(
     funscript_data: Dict,
-    target_version: str
+    target_version: str,
+    version: Optional[str] = None
 ) -> Optional[Dict]:
     """
     Convert a funscript between v1.1 and v2.0 formats using funlib_py.
@@ -189,14 +385,14 @@ def convert_funscript_format(
     Args:
         funscript_data: Input funscript data (v1.1 or v2.0)
         target_version: Target version ('1.1' or '2.0')
+        version: Version of funscript_data if the caller already detected it
 
     Returns:
         Converted funscript data or None on error
     """
-    sys.path.insert(0, os.path.dirname(__file__))
-    from funlib_py import Funscript
+    Funscript = _funscript_class()
 
-    current_version = get_funscript_version(funscript_data)
+    current_version = version or get_funscript_version(funscript_data)
 
     if current_version == target_version:
         return funscript_data
@@ -212,24 +408,66 @@ def convert_funscript_format(
         return None
 
 
-def save_funscript(file_path: str, data: Dict) -> bool:
-    """Save funscript to file."""
+# stdlib encoders for the fallback path, json.dumps would build a new one per call
+_json_encode_compact = json.JSONEncoder(separators=(',', ':')).encode
+_json_encode_indented = json.JSONEncoder(indent=2).encode
+
+
+def _dump_json_bytes(data, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes (compact unless `indent`), with orjson when available."""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:
+            # huge ints and other values only stdlib json handles
+            pass
+    encode = _json_encode_indented if indent else _json_encode_compact
+    return encode(data).encode('utf-8')
+
+
+def save_funscript(file_path: str, data: Dict, indent: bool = False) -> bool:
+    """Save funscript to file, as compact JSON unless `indent` is set."""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        buf = _dump_json_bytes(data, indent)
+        with open(file_path, 'wb') as f:
+            f.write(buf)
         return True
     except Exception:
         return False
 
 
-def get_merged_channels(funscript_data: Dict) -> list:
+@lru_cache(maxsize=None)
+def _axis_id_channels() -> Dict:
+    """
+    v1.1 axis id -> channel name, built once.
+
+    Covers the string ids in AXIS_MAPPING (e.g. 'L1', 'R0', 'A1') and the
+    legacy numeric ids from funlib_py's axis tables.
+    """
+    _funscript_class()  # makes sure funlib_py is importable
+    from funlib_py.converter import numericAxisMap, axisToNameMap
+    table = {
+        axis_id: axisToNameMap[axis_code]
+        for axis_id, axis_code in numericAxisMap.items()
+        if axis_code and axis_code in axisToNameMap
+    }
+    table.update(AXIS_MAPPING)
+    return table
+
+
+def get_merged_channels(funscript_data: Dict, version: Optional[str] = None) -> list:
     """
     Get list of channel names from a merged funscript.
 
+    Args:
+        funscript_data: Merged funscript data (v1.1 or v2.0)
+        version: Version of funscript_data if the caller already detected it
+
     Returns:
         List of channel names (e.g., ['stroke', 'surge', 'pitch'])
     """
-    version = get_funscript_version(funscript_data)
+    version = version or get_funscript_version(funscript_data)
 
     if version == '2.0':
         channels = funscript_data.get('channels', {})
@@ -237,70 +475,77 @@ def get_merged_channels(funscript_data: Dict) -> list:
 
     if version == '1.1':
         axes = funscript_data.get('axes', [])
-        channel_names = []
-        for axis in axes:
-            axis_id = axis.get('id')
-            # Handle string axis IDs (e.g., 'L1', 'R0', 'A1')
-            if isinstance(axis_id, str) and axis_id in AXIS_MAPPING:
-                channel_names.append(AXIS_MAPPING[axis_id])
-            # Handle legacy numeric axis IDs
-            elif isinstance(axis_id, int):
-                from funlib_py.converter import numericAxisMap, axisToNameMap
-                axis_code = numericAxisMap.get(axis_id)
-                if axis_code and axis_code in axisToNameMap:
-                    channel_names.append(axisToNameMap[axis_code])
-        return channel_names
+        channels_by_id = _axis_id_channels()
+        # only str/int ids, a float or unhashable id never names a channel
+        return [
+            channels_by_id[axis_id]
+            for axis_id in (axis.get('id') for axis in axes)
+            if isinstance(axis_id, (str, int)) and axis_id in channels_by_id
+        ]
     return []
 
 
-def unmerge_funscript(funscript_data: Dict, base_path: str) -> Optional[Dict]:
+def _chapters_to_json(metadata: Dict) -> Dict:
+    """Replace FunChapter objects in metadata['chapters'] with their JSON, in place."""
+    chapters_list = metadata.get('chapters')
+    if chapters_list and hasattr(chapters_list[0], 'toJSON'):
+        # all FunChapter, so look the method up once
+        to_json = type(chapters_list[0]).toJSON
+        metadata['chapters'] = [to_json(ch) for ch in chapters_list]
+    return metadata
+
+
+def unmerge_funscript(
+    funscript_data: Dict,
+    base_path: str,
+    version: Optional[str] = None
+) -> Optional[Dict]:
     """
     Split a merged funscript into separate v1.0 scripts using funlib_py.
 
     Args:
         funscript_data: Merged funscript data (v1.1 or v2.0)
         base_path: Base file path without extension
+        version: Version of funscript_data if the caller already detected it
 
     Returns:
         Dict mapping channel names to their file paths, or None on error
     """
-    sys.path.insert(0, os.path.dirname(__file__))
-    from funlib_py import Funscript
+    Funscript = _funscript_class()
 
-    version = get_funscript_version(funscript_data)
+    version = version or get_funscript_version(funscript_data)
     if version == '1.0':
         return None
 
     try:
         script = Funscript(funscript_data)
 
-        parent_metadata = script.metadata.toJSON()
+        # converted once here, channels without metadata of their own share this dict as-is
+        parent_metadata = _chapters_to_json(script.metadata.toJSON())
 
         scripts_list = script.toJSON({'version': '1.0-list'})
 
         if not scripts_list or len(scripts_list) == 0:
             return None
 
-        saved_files = {}
+        # (channel key, file path, script data) for every channel, written together below
+        outputs = []
 
         for script_data in scripts_list:
             channel = script_data.get('channel')
 
             script_data['version'] = '1.0'
 
-            if 'metadata' not in script_data or not script_data['metadata']:
-                script_data['metadata'] = dict(parent_metadata)
+            current_metadata = script_data.get('metadata')
+            if not current_metadata:
+                script_data['metadata'] = parent_metadata
             else:
-                current_metadata = script_data['metadata']
+                # only the channel's own chapters need converting, inherited ones already are
+                _chapters_to_json(current_metadata)
                 for key, value in parent_metadata.items():
                     if key not in current_metadata:
                         current_metadata[key] = value
 
-            if 'chapters' in script_data['metadata'] and script_data['metadata']['chapters']:
-                chapters_list = script_data['metadata']['chapters']
-                if hasattr(chapters_list[0], 'toJSON'):
-                    script_data['metadata']['chapters'] = [ch.toJSON() for ch in chapters_list]
-
             script_data.pop('id', None)
             script_data.pop('axes', None)
             script_data.pop('channels', None)
@@ -314,46 +559,42 @@ def unmerge_funscript(funscript_data: Dict, base_path: str) -> Optional[Dict]:
                 file_path = f"{base_path}.funscript"
                 channel_key = 'stroke'
 
-            if save_funscript(file_path, script_data):
-                saved_files[channel_key] = file_path
+            outputs.append((channel_key, file_path, script_data))
+
+        # the files are independent, so one channel's write overlaps the next one's serialization
+        with ThreadPoolExecutor(max_workers=min(UNMERGE_WORKERS, len(outputs))) as executor:
+            saved = executor.map(save_funscript, [o[1] for o in outputs], [o[2] for o in outputs])
+            saved_files = {
+                channel_key: file_path
+                for (channel_key, file_path, _), ok in zip(outputs, saved) if ok
+            }
 
         return saved_files if saved_files else None
 
     except Exception as e:
-        import traceback
-        print(f"unmerge_funscript error: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        # formatted by the handler, which without logging configured is stderr like log()
+        _logger.exception("unmerge_funscript error: %s (%s)", e, base_path)
         return None
 
 
-def save_funscript(file_path: str, data: Dict) -> bool:
-    """Save funscript to file."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception:
-        return False
-
 def extract_variant_suffix(filename: str, base_name: str) -> str:
-    if filename == f"{base_name}.funscript":
-        return ""
-
-    if not filename.startswith(base_name):
+    # both ends checked in place, then a single slice for the suffix ("" for the default variant)
+    if not filename.startswith(base_name) or not filename.endswith(".funscript", len(base_name)):
         return None
 
-    suffix = filename[len(base_name):]
+    suffix = filename[len(base_name):-len(".funscript")]
 
     if suffix.startswith("."):
         return None
 
-    if suffix.endswith(".funscript"):
-        return suffix[:-len(".funscript")]
+    return suffix
+
 
-    return None
+# ".<axis>" filename suffix -> axis, for find_script_variants_and_axes
+_AXIS_BY_SUFFIX = {f".{axis}": axis for axis in AXIS_EXTENSIONS}
 
 
-def find_script_variants_and_axes(directory: str, base_name: str) -> tuple:
+def find_script_variants_and_axes(directory: str, base_name: str, cached: bool = True) -> tuple:
     """
     Find all funscript variants and axis scripts in a directory.
     
@@ -370,49 +611,42 @@ def find_script_variants_and_axes(directory: str, base_name: str) -> tuple:
     Args:
         directory: Directory to search for scripts
         base_name: Base name without extension (e.g., "Scene" for "Scene.mp4")
+        cached: False to read the directory again, e.g. after moving files in it
     
     Returns:
         Tuple of (variants_dict, axes_dict) where:
         - variants_dict: {variant_key: {'path': str, 'filename': str, 'suffix': str}}
         - axes_dict: {axis_name: full_path}
     """
-    from typing import Dict, Tuple
-    
     variants = {}
     axes = {}
 
-    try:
-        all_files = os.listdir(directory)
-    except OSError:
-        return {}, {}
+    # shared with find_funscript_paths, unreadable directories come back empty
+    all_files, _ = _list_dir(directory, cached)
+
+    # <base_name><suffix>.funscript, the suffix is what tells axes and variants apart
+    script_pattern = re.compile(re.escape(base_name) + r'(.*)\.funscript\Z', re.DOTALL)
+    # joined once, each match then only needs a concatenation
+    dir_prefix = os.path.join(directory, '')
 
-    # Filter to just funscript files matching base name
-    all_scripts = []
     for filename in all_files:
-        if filename.startswith(base_name) and filename.endswith('.funscript'):
-            # Skip .max.funscript files (intermediate merge files)
-            if '.max.funscript' not in filename:
-                all_scripts.append(filename)
-
-    # Separate variants from axis scripts
-    for filename in all_scripts:
-        full_path = os.path.join(directory, filename)
-        
-        # Check if it's an axis script
-        is_axis = False
-        for axis in AXIS_EXTENSIONS:
-            if filename == f"{base_name}.{axis}.funscript":
-                axes[axis] = full_path
-                is_axis = True
-                break
-
-        if is_axis:
+        # cheap prefix check first, most of a scene directory is other scenes' files
+        if not filename.startswith(base_name):
             continue
+        match = script_pattern.match(filename)
+        # Skip .max.funscript files (intermediate merge files)
+        if not match or '.max.funscript' in filename:
+            continue
+
+        full_path = dir_prefix + filename
+        variant_suffix = match.group(1)
 
-        # It's a variant - extract suffix
-        variant_suffix = extract_variant_suffix(filename, base_name)
+        axis = _AXIS_BY_SUFFIX.get(variant_suffix)
+        if axis:
+            axes[axis] = full_path
+            continue
 
-        if variant_suffix is None:
+        if variant_suffix.startswith('.'):
             continue  # Doesn't match expected pattern
 
         variant_key = variant_suffix if variant_suffix else "default"
@@ -426,28 +660,67 @@ def find_script_variants_and_axes(directory: str, base_name: str) -> tuple:
 
 def read_stdin():
     """Read and parse JSON from stdin."""
-    input_data = sys.stdin.read()
-    return json.loads(input_data)
+    stdin = getattr(sys.stdin, 'buffer', None)
+    if stdin is None:
+        return json.loads(sys.stdin.read())
+    return _load_json_bytes(stdin.read())
 
 
 def write_stdout(data):
     """Write JSON to stdout."""
-    print(json.dumps(data), flush=True)
+    buf = _dump_json_bytes(data)
+    stdout = getattr(sys.stdout, 'buffer', None)
+    if stdout is None:
+        print(buf.decode('utf-8'), flush=True)
+        return
+    # anything already printed must come first
+    sys.stdout.flush()
+    stdout.write(buf + b'\n')
+    stdout.flush()
+
+
+_session = None
 
 
-def query_interactive_scenes(server_url: str, cookies: Dict = None, filter_has_funscripts: bool = True) -> List[Dict]:
+def _requests_session():
     """
-    Query Stash for all interactive scenes using GraphQL.
+    Shared requests.Session for the Stash GraphQL calls, so repeated calls reuse
+    pooled connections instead of opening a new one each time.
+    Callers import requests first to handle it being unavailable.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers['Content-Type'] = 'application/json'
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session = session
+    return _session
+
+
+def query_interactive_scenes(
+    server_url: str,
+    cookies: Dict = None,
+    filter_has_funscripts: bool = True,
+    include_title: bool = True
+) -> List[Dict]:
+    """
+    Query Stash for all interactive scenes using GraphQL, SCENES_PAGE_SIZE scenes per request.
     
     Args:
         server_url: Stash GraphQL endpoint URL (e.g., "http://localhost:9999/graphql")
         cookies: Optional session cookies for authentication
         filter_has_funscripts: If True, only return scenes with actual funscript files
+        include_title: If False, titles are neither requested nor returned
     
     Returns:
         List of dicts with scene data:
         - id: Scene ID
-        - title: Scene title (optional)
+        - title: Scene title (only with include_title)
         - oshash: File oshash fingerprint
         - file_path: Full path to video file
         
@@ -462,13 +735,13 @@ def query_interactive_scenes(server_url: str, cookies: Dict = None, filter_has_f
         log("Error: requests module not available for query_interactive_scenes")
         return []
     
+    # only the fields used below, every scene is already filtered to interactive
     query = """
     query FindScenes($filter: FindFilterType, $scene_filter: SceneFilterType) {
         findScenes(filter: $filter, scene_filter: $scene_filter) {
             count
             scenes {
-                id
-                title
+                id%s
                 files {
                     path
                     fingerprints {
@@ -476,72 +749,87 @@ def query_interactive_scenes(server_url: str, cookies: Dict = None, filter_has_f
                         value
                     }
                 }
-                interactive
             }
         }
     }
-    """
-    
-    variables = {
-        "filter": {"per_page": -1},
-        "scene_filter": {"interactive": True}
-    }
-    
-    headers = {"Content-Type": "application/json"}
+    """ % ("\n                title" if include_title else "")
     
+    result = []
+    # find_funscript_paths futures, parallel to result
+    checks = []
     try:
-        response = requests.post(
-            server_url,
-            json={"query": query, "variables": variables},
-            headers=headers,
-            cookies=cookies,
-            timeout=60
-        )
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'errors' in data:
-            log(f"GraphQL errors: {data['errors']}")
-            return []
-        
-        scenes = data.get('data', {}).get('findScenes', {}).get('scenes', [])
-        log(f"Found {len(scenes)} interactive scenes")
-        
-        result = []
-        for idx, scene in enumerate(scenes, 1):
-            if idx % 100 == 0:
-                log(f"  Processing scene {idx}/{len(scenes)}...")
-            
-            if not scene.get('files'):
-                continue
-            
-            file = scene['files'][0]
-            file_path = file['path']
-            
-            # Extract oshash fingerprint
-            oshash = None
-            for fp in file.get('fingerprints', []):
-                if fp['type'] == 'oshash':
-                    oshash = fp['value']
+        # directory checks for one page run on the pool while the next page is fetched
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            page = 1
+            total = 0
+            processed = 0
+            while True:
+                variables = {
+                    # sorted by id so pages stay consistent with each other
+                    "filter": {"per_page": SCENES_PAGE_SIZE, "page": page, "sort": "id", "direction": "ASC"},
+                    "scene_filter": {"interactive": True}
+                }
+                response = _requests_session().post(
+                    server_url,
+                    json={"query": query, "variables": variables},
+                    cookies=cookies,
+                    timeout=60
+                )
+                response.raise_for_status()
+                # pages are the largest responses, parse the raw bytes with orjson when available
+                data = _load_json_bytes(response.content)
+
+                if 'errors' in data:
+                    log(f"GraphQL errors: {data['errors']}")
+                    return []
+
+                find_scenes = data.get('data', {}).get('findScenes', {})
+                scenes = find_scenes.get('scenes', [])
+                if page == 1:
+                    total = find_scenes.get('count', len(scenes))
+                    log(f"Found {total} interactive scenes")
+
+                for scene in scenes:
+                    processed += 1
+                    if processed % 100 == 0:
+                        log(f"  Processing scene {processed}/{total}...")
+
+                    if not scene.get('files'):
+                        continue
+
+                    file = scene['files'][0]
+                    file_path = file['path']
+
+                    # Extract oshash fingerprint
+                    oshash = None
+                    for fp in file.get('fingerprints', []):
+                        if fp['type'] == 'oshash':
+                            oshash = fp['value']
+                            break
+
+                    if not oshash:
+                        continue
+
+                    entry = {
+                        'id': scene['id'],
+                        'oshash': oshash,
+                        'file_path': file_path
+                    }
+                    if include_title:
+                        entry['title'] = scene.get('title', '')
+                    result.append(entry)
+
+                    # Check if scene has funscripts (if filtering enabled)
+                    if filter_has_funscripts:
+                        checks.append(executor.submit(find_funscript_paths, os.path.splitext(file_path)[0]))
+
+                if len(scenes) < SCENES_PAGE_SIZE:
                     break
-            
-            if not oshash:
-                continue
-            
-            # Check if scene has funscripts (if filtering enabled)
+                page += 1
+
             if filter_has_funscripts:
-                base_path = os.path.splitext(file_path)[0]
-                scripts = find_funscript_paths(base_path)
-                if not scripts:
-                    continue
-            
-            result.append({
-                'id': scene['id'],
-                'title': scene.get('title', ''),
-                'oshash': oshash,
-                'file_path': file_path
-            })
-        
+                result = [e for e, check in zip(result, checks) if check.result()]
+
         log(f"Found {len(result)} scenes" + (" with funscripts" if filter_has_funscripts else ""))
         return result
     
@@ -584,33 +872,23 @@ def merge_funscripts(scripts: Dict[str, Dict], target_version: str = '1.1') -> D
         - Empty channel data is filtered out automatically
     """
     try:
-        from funlib_py import Funscript
+        Funscript = _funscript_class()
     except ImportError:
         raise ImportError("funlib_py is required for merge_funscripts")
     
     # Find the main axis (stroke/L0/main take priority)
-    main_axis = None
-    for axis in ['stroke', 'L0', 'main']:
-        if axis in scripts:
-            main_axis = axis
-            break
-    
-    if not main_axis:
-        main_axis = list(scripts.keys())[0]
+    main_axis = next((axis for axis in MAIN_AXIS_PRIORITY if axis in scripts), None)
+    if main_axis is None:
+        main_axis = next(iter(scripts))
     
     main_script_data = scripts[main_axis]
     
-    # Build channels list for additional axes
-    channels_data = []
-    for axis_name, script_data in scripts.items():
-        if axis_name == main_axis:
-            continue
-        
-        # Create channel with proper ID and channel name (normalize aliases)
-        channel_script = dict(script_data)
-        channel_script['id'] = axis_name
-        channel_script['channel'] = AXIS_MAPPING.get(axis_name, axis_name)
-        channels_data.append(channel_script)
+    # Build channels list for additional axes, with proper ID and channel name (normalize aliases)
+    channels_data = [
+        {**script_data, 'id': axis_name, 'channel': AXIS_MAPPING.get(axis_name, axis_name)}
+        for axis_name, script_data in scripts.items()
+        if axis_name != main_axis
+    ]
     
     # Create merged Funscript object
     if channels_data:
@@ -634,6 +912,11 @@ def log(message):
     print(message, file=sys.stderr, flush=True)
 
 
+# load_plugin_settings coercion keyed by the exact type of the default value,
+# so bool defaults never fall through to int; other types are kept as stored
+_SETTING_CONVERTERS = {bool: bool, int: int}
+
+
 def load_plugin_settings(
     server_connection: Dict,
     plugin_name: str,
@@ -700,10 +983,9 @@ def load_plugin_settings(
     """
     
     try:
-        response = requests.post(
+        response = _requests_session().post(
             server_url,
             json={'query': config_query},
-            headers={'Content-Type': 'application/json'},
             cookies=cookies,
             timeout=10
         )
@@ -712,7 +994,7 @@ def load_plugin_settings(
             log(f"Warning: Configuration API returned status {response.status_code}, using defaults")
             return default_settings.copy()
         
-        data = response.json()
+        data = _load_json_bytes(response.content)
         plugins_config = data.get('data', {}).get('configuration', {}).get('plugins', {})
         plugin_settings = plugins_config.get(plugin_name, {})
         
@@ -725,12 +1007,8 @@ def load_plugin_settings(
         for key, default_value in default_settings.items():
             if key in plugin_settings:
                 # Convert to appropriate type based on default
-                if isinstance(default_value, bool):
-                    settings[key] = bool(plugin_settings[key])
-                elif isinstance(default_value, int):
-                    settings[key] = int(plugin_settings[key])
-                else:
-                    settings[key] = plugin_settings[key]
+                convert = _SETTING_CONVERTERS.get(type(default_value))
+                settings[key] = convert(plugin_settings[key]) if convert else plugin_settings[key]
         
         # Log loaded settings
         settings_str = ', '.join(f"{k}={v}" for k, v in settings.items())
@@ -792,10 +1070,9 @@ def save_plugin_setting(
     """
 
     try:
-        response = requests.post(
+        response = _requests_session().post(
             server_url,
             json={'query': config_query},
-            headers={'Content-Type': 'application/json'},
             cookies=cookies,
             timeout=10
         )
@@ -804,21 +1081,20 @@ def save_plugin_setting(
             log(f"Warning: Configuration API returned status {response.status_code}")
             return False
 
-        data = response.json()
+        data = _load_json_bytes(response.content)
         plugins_config = data.get('data', {}).get('configuration', {}).get('plugins', {})
         plugin_settings = plugins_config.get(plugin_name, {})
         plugin_settings[setting_key] = setting_value
         plugins_config[plugin_name] = plugin_settings
 
         # Write back via configurePlugin mutation
-        import json
         mutation = """
         mutation ConfigurePlugin($plugin_id: ID!, $enabled: Boolean, $settings: Map) {
             configurePlugin(input: {plugin_id: $plugin_id, enabled: $enabled, settings: $settings})
         }
         """
 
-        response = requests.post(
+        response = _requests_session().post(
             server_url,
             json={
                 'query': mutation,
@@ -827,7 +1103,6 @@ def save_plugin_setting(
                     'settings': plugin_settings
                 }
             },
-            headers={'Content-Type': 'application/json'},
             cookies=cookies,
             timeout=10
         )
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+toSvgElement with normalize=True must render exactly what s.clone().normalize() renders,
+whether or not the script takes the shared-actions path.
+"""
+
+from funlib_py import Funscript
+from funlib_py.svg import SvgOptions, _normalizedView, toSvgElement
+
+
+def _script(metadata, channels=None, pos=lambda i: (i * 37) % 101):
+    data = {
+        'metadata': metadata,
+        'actions': [{'at': i * 1000, 'pos': pos(i)} for i in range(61)],
+    }
+    if channels:
+        data['channels'] = {
+            ch: {'actions': [{'at': i * 500, 'pos': (i * 13) % 101} for i in range(100)]}
+            for ch in channels
+        }
+    return Funscript(data)
+
+
+def _assertSameAsClone(script):
+    ops = dict(normalize=True, title='test')
+    expected = toSvgElement(script.clone().normalize(), SvgOptions(**{**ops, 'normalize': False}))
+    assert toSvgElement(script, SvgOptions(**ops)) == expected
+
+
+def test_duration_differs_from_actions():
+    script = _script({'duration': 100})
+    assert _normalizedView(script).actions is script.actions
+    _assertSameAsClone(script)
+
+
+def test_chapters():
+    script = _script({
+        'duration': 70,
+        'chapters': [
+            {'name': 'a', 'startTime': '00:00:00.000', 'endTime': '00:00:30.000'},
+            {'name': 'b', 'startTime': '00:00:30.000', 'endTime': '00:01:10.000'},
+        ],
+    })
+    assert _normalizedView(script).actions is script.actions
+    _assertSameAsClone(script)
+
+
+def test_channels():
+    script = _script({'duration': 100}, channels=['pitch', 'roll'])
+    view = _normalizedView(script)
+    assert view.channels['pitch'].actions is script.channels['pitch'].actions
+    _assertSameAsClone(script)
+
+
+def test_not_normalized_falls_back_to_clone():
+    script = _script({'duration': 100}, pos=lambda i: i * 2.5 - 10)
+    assert _normalizedView(script).actions is not script.actions
+    _assertSameAsClone(script)
+    assert script.actions[0].pos == -10
@@ -6,10 +6,13 @@ Merges multi-axis funscripts into v1.1 or v2.0 format.
 Handles file operations (move/delete originals).
 """
 
+import contextlib
+import io
 import os
 import sys
 import shutil
-from typing import Dict, List, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple
 
 sys.path.insert(
     0,
@@ -18,6 +21,7 @@ sys.path.insert(
 from funscript_utils import (
     find_funscript_paths,
     read_funscript_json,
+    read_funscript_header,
     is_merged_funscript,
     save_funscript,
     read_stdin,
@@ -29,21 +33,45 @@ from funscript_utils import (
     query_interactive_scenes,
     merge_funscripts,
     load_plugin_settings,
-    deduplicate_axis_scripts
+    deduplicate_axis_scripts,
+    scan_dir,
+    has_entry
 )
 
-sys.path.insert(
-    0,
-    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'funUtil')
-)
 from funlib_py import Funscript
 
 
 KNOWN_AXES = set(AXIS_EXTENSIONS)
 
+# worker processes for batch runs, each takes one scene directory at a time
+BATCH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _fast_move(src: str, dst: str):
+    """
+    Move a file with a single os.replace, which is the common case since
+    originalFunscripts/ sits next to the scripts. Anything os.replace cannot do
+    (another filesystem, dst being a directory) goes to shutil.move as before.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+# directories _ensure_dir has already created or found in this process
+_ensured_dirs = set()
+
+
+def _ensure_dir(directory: str):
+    """os.makedirs(directory, exist_ok=True), done once per directory per run."""
+    if directory not in _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
 
 def find_all_script_variants(directory: str, base_name: str) -> Dict[str, Dict]:
-    variants, shared_axes = find_script_variants_and_axes(directory, base_name)
+    variants, shared_axes = find_script_variants_and_axes(directory, base_name, cached=False)
 
     if "default" in variants and shared_axes:
         variants["default"]['axes'] = shared_axes
@@ -73,20 +101,20 @@ def handle_original_files(
             os.path.dirname(base_path),
             'originalFunscripts'
         )
-        os.makedirs(originals_dir, exist_ok=True)
+        _ensure_dir(originals_dir)
 
         for file_path in scripts.values():
             filename = os.path.basename(file_path)
             dest = os.path.join(originals_dir, filename)
             try:
-                shutil.move(file_path, dest)
+                _fast_move(file_path, dest)
                 log(f"  Moved {filename} to 'originalFunscripts/'")
             except (OSError, IOError) as e:
                 log(f"  Error moving {file_path}: {e}")
 
         final_path = f"{base_path}.funscript"
         try:
-            shutil.move(max_path, final_path)
+            _fast_move(max_path, final_path)
             log("  Renamed .max.funscript to .funscript")
         except (OSError, IOError) as e:
             log(f"  Error renaming: {e}")
@@ -101,7 +129,7 @@ def handle_original_files(
 
         final_path = f"{base_path}.funscript"
         try:
-            shutil.move(max_path, final_path)
+            _fast_move(max_path, final_path)
             log("  Renamed .max.funscript to .funscript")
         except (OSError, IOError) as e:
             log(f"  Error renaming: {e}")
@@ -144,12 +172,12 @@ def process_single_variant(
             video_base = base_name
 
         available_axes = {}
-        if os.path.exists(originals_dir):
+        _, original_entries = scan_dir(originals_dir)
+        if original_entries:
             for axis in KNOWN_AXES:
                 axis_file = f"{video_base}.{axis}.funscript"
-                axis_path = os.path.join(originals_dir, axis_file)
-                if os.path.exists(axis_path):
-                    available_axes[axis] = axis_path
+                if has_entry(original_entries, originals_dir, axis_file):
+                    available_axes[axis] = os.path.join(originals_dir, axis_file)
 
         if available_axes:
             is_merged = is_merged_funscript(data)
@@ -158,7 +186,7 @@ def process_single_variant(
                 from funscript_utils import get_funscript_version, convert_funscript_format, get_merged_channels
 
                 current_version = get_funscript_version(data)
-                existing_channels = set(get_merged_channels(data))
+                existing_channels = set(get_merged_channels(data, current_version))
                 available_axis_names = set(available_axes.keys())
                 missing_axes = available_axis_names - existing_channels
 
@@ -166,8 +194,8 @@ def process_single_variant(
                     log(f"  → Variant{suffix}: Merged script missing axes: {', '.join(sorted(missing_axes))}")
 
                     original_main_in_originals = os.path.join(originals_dir, f"{base_name}.funscript")
-                    all_originals_found = os.path.exists(original_main_in_originals) and all(
-                        os.path.exists(os.path.join(originals_dir, f"{video_base}.{ch}.funscript")) 
+                    all_originals_found = has_entry(original_entries, originals_dir, f"{base_name}.funscript") and all(
+                        has_entry(original_entries, originals_dir, f"{video_base}.{ch}.funscript")
                         for ch in existing_channels
                     )
 
@@ -203,7 +231,7 @@ def process_single_variant(
                         log(f"  ⚠ Variant{suffix}: Originals not found, will unmerge to extract them")
                         log(f"  ⟳ Variant{suffix}: Unmerging v{current_version} script...")
 
-                        saved_files = unmerge_funscript(data, variant_base_path)
+                        saved_files = unmerge_funscript(data, variant_base_path, current_version)
 
                         if not saved_files:
                             log(f"  ✗ Variant{suffix}: Unmerge failed")
@@ -249,7 +277,7 @@ def process_single_variant(
                     return False
 
                 log(f"  ⟳ Variant{suffix}: Converting from v{current_version} to v{target_version}...")
-                converted = convert_funscript_format(data, target_version)
+                converted = convert_funscript_format(data, target_version, current_version)
 
                 if converted and save_funscript(main_path, converted):
                     log(f"  ✓ Variant{suffix}: Converted to v{target_version}")
@@ -298,7 +326,7 @@ def process_single_variant(
         )
 
         current_version = get_funscript_version(main_data_check)
-        existing_channels = set(get_merged_channels(main_data_check))
+        existing_channels = set(get_merged_channels(main_data_check, current_version))
         new_axis_names = set(deduped_axes.keys()) - existing_channels
 
         if not new_axis_names:
@@ -306,11 +334,11 @@ def process_single_variant(
                 # No new axes, correct version — just handle duplicates
                 if duplicate_axes and file_mode == 1:
                     originals_dir = os.path.join(os.path.dirname(main_path), 'originalFunscripts')
-                    os.makedirs(originals_dir, exist_ok=True)
+                    _ensure_dir(originals_dir)
                     for dk, dp in duplicate_axes.items():
                         fn = os.path.basename(dp)
                         try:
-                            shutil.move(dp, os.path.join(originals_dir, fn))
+                            _fast_move(dp, os.path.join(originals_dir, fn))
                             log(f"  → Moved duplicate {fn} to originalFunscripts/")
                         except (OSError, IOError) as e:
                             log(f"  ✗ Error moving {fn}: {e}")
@@ -325,7 +353,7 @@ def process_single_variant(
                 return False
 
             log(f"  ⟳ Variant{suffix}: Converting from v{current_version} to v{target_version}...")
-            converted = convert_funscript_format(main_data_check, target_version)
+            converted = convert_funscript_format(main_data_check, target_version, current_version)
             if converted and save_funscript(main_path, converted):
                 log(f"  ✓ Variant{suffix}: Converted to v{target_version}")
                 return True
@@ -340,9 +368,10 @@ def process_single_variant(
         base_name = os.path.splitext(os.path.basename(main_path))[0]
         video_base = base_name[:-len(suffix)] if (suffix and base_name.endswith(suffix)) else base_name
 
+        _, original_entries = scan_dir(originals_dir)
         original_main_path = os.path.join(originals_dir, f"{base_name}.funscript")
-        all_originals_found = os.path.exists(original_main_path) and all(
-            os.path.exists(os.path.join(originals_dir, f"{video_base}.{ch}.funscript"))
+        all_originals_found = has_entry(original_entries, originals_dir, f"{base_name}.funscript") and all(
+            has_entry(original_entries, originals_dir, f"{video_base}.{ch}.funscript")
             for ch in existing_channels
         )
 
@@ -377,13 +406,13 @@ def process_single_variant(
 
                 # Move new axis files + duplicates to originalFunscripts/
                 if file_mode == 1:
-                    os.makedirs(originals_dir, exist_ok=True)
+                    _ensure_dir(originals_dir)
                     for files_dict in [deduped_axes, duplicate_axes]:
                         for ak, ap in files_dict.items():
                             fn = os.path.basename(ap)
                             dest = os.path.join(originals_dir, fn)
                             try:
-                                shutil.move(ap, dest)
+                                _fast_move(ap, dest)
                                 log(f"  → Moved {fn} to originalFunscripts/")
                             except (OSError, IOError) as e:
                                 log(f"  ✗ Error moving {fn}: {e}")
@@ -403,7 +432,7 @@ def process_single_variant(
             # No originals — unmerge, then re-merge with all axes
             log(f"  ⚠ Variant{suffix}: Originals not found, will unmerge first")
 
-            saved_files = unmerge_funscript(main_data_check, variant_base_path)
+            saved_files = unmerge_funscript(main_data_check, variant_base_path, current_version)
             if not saved_files:
                 log(f"  ✗ Variant{suffix}: Unmerge failed")
                 return False
@@ -433,13 +462,13 @@ def process_single_variant(
                 log(f"  ✓ Variant{suffix}: Re-merged with all axes")
 
                 if file_mode == 1:
-                    os.makedirs(originals_dir, exist_ok=True)
+                    _ensure_dir(originals_dir)
                     for files_dict in [saved_files, deduped_axes, duplicate_axes]:
                         for k, p in files_dict.items():
                             fn = os.path.basename(p)
                             dest = os.path.join(originals_dir, fn)
                             try:
-                                shutil.move(p, dest)
+                                _fast_move(p, dest)
                                 log(f"  → Moved {fn} to originalFunscripts/")
                             except (OSError, IOError):
                                 pass
@@ -495,20 +524,20 @@ def process_single_variant(
 
     if file_mode == 1:
         originals_dir = os.path.join(os.path.dirname(variant_base_path), 'originalFunscripts')
-        os.makedirs(originals_dir, exist_ok=True)
+        _ensure_dir(originals_dir)
 
         for file_path in scripts_paths.values():
             filename = os.path.basename(file_path)
             dest = os.path.join(originals_dir, filename)
             try:
-                shutil.move(file_path, dest)
+                _fast_move(file_path, dest)
             except (OSError, IOError):
                 pass
 
         try:
             if os.path.exists(variant_base_path + ".funscript"):
                 os.remove(variant_base_path + ".funscript")
-            shutil.move(max_path, variant_base_path + ".funscript")
+            _fast_move(max_path, variant_base_path + ".funscript")
             log(f"  ✓ Variant{suffix}: Renamed to .funscript")
         except (OSError, IOError) as e:
             log(f"  ✗ Variant{suffix}: Error renaming: {e}")
@@ -524,7 +553,7 @@ def process_single_variant(
         try:
             if os.path.exists(variant_base_path + ".funscript"):
                 os.remove(variant_base_path + ".funscript")
-            shutil.move(max_path, variant_base_path + ".funscript")
+            _fast_move(max_path, variant_base_path + ".funscript")
             log(f"  ✓ Variant{suffix}: Renamed to .funscript")
         except (OSError, IOError) as e:
             log(f"  ✗ Variant{suffix}: Error renaming: {e}")
@@ -555,7 +584,7 @@ def process_scene(
         directory = os.path.dirname(base_path)
         base_name = os.path.basename(base_path)
 
-        variants, shared_axes = find_script_variants_and_axes(directory, base_name)
+        variants, shared_axes = find_script_variants_and_axes(directory, base_name, cached=False)
 
         if not variants:
             log("  ⊘ No script variants found")
@@ -577,11 +606,13 @@ def process_scene(
             originals_dir = os.path.join(directory, 'originalFunscripts')
 
             if os.path.exists(originals_dir):
+                # read per variant, the previous one may have moved files in
+                _, original_entries = scan_dir(originals_dir)
                 available_axes = {}
                 for axis, axis_path in shared_axes.items():
-                    original_location = os.path.join(originals_dir, os.path.basename(axis_path))
-                    if os.path.exists(original_location):
-                        available_axes[axis] = original_location
+                    axis_file = os.path.basename(axis_path)
+                    if has_entry(original_entries, originals_dir, axis_file):
+                        available_axes[axis] = os.path.join(originals_dir, axis_file)
                     elif os.path.exists(axis_path):
                         available_axes[axis] = axis_path
                 variant_data['axes'] = available_axes
@@ -611,14 +642,14 @@ def process_scene(
 
         if needs_conversion:
             log(f"  ⟳ Converting .max.funscript from v{current_version} to v{target_version}...")
-            converted = convert_funscript_format(data, target_version)
+            converted = convert_funscript_format(data, target_version, current_version)
             if not converted:
                 log("  ✗ Failed to convert .max.funscript")
                 return False
             merged_channels = get_merged_channels(converted)
         else:
 
-            merged_channels = get_merged_channels(data)
+            merged_channels = get_merged_channels(data, current_version)
             converted = data
 
         log(f"  → Merged script contains: {', '.join(merged_channels) if merged_channels else 'stroke only'}")
@@ -634,16 +665,17 @@ def process_scene(
                 scripts_to_handle[channel] = channel_path
 
         originals_dir = os.path.join(os.path.dirname(base_path), 'originalFunscripts')
-        if os.path.exists(originals_dir):
+        _, original_entries = scan_dir(originals_dir)
+        if original_entries:
             base_name = os.path.basename(base_path)
-            original_main = os.path.join(originals_dir, f"{base_name}.funscript")
-            if os.path.exists(original_main) and 'main' not in scripts_to_handle:
-                scripts_to_handle['main'] = original_main
+            original_main = f"{base_name}.funscript"
+            if has_entry(original_entries, originals_dir, original_main) and 'main' not in scripts_to_handle:
+                scripts_to_handle['main'] = os.path.join(originals_dir, original_main)
 
             for channel in merged_channels:
-                original_channel = os.path.join(originals_dir, f"{base_name}.{channel}.funscript")
-                if os.path.exists(original_channel) and channel not in scripts_to_handle:
-                    scripts_to_handle[channel] = original_channel
+                original_channel = f"{base_name}.{channel}.funscript"
+                if has_entry(original_entries, originals_dir, original_channel) and channel not in scripts_to_handle:
+                    scripts_to_handle[channel] = os.path.join(originals_dir, original_channel)
 
         if not needs_conversion and not scripts_to_handle:
             log(f"  ⊘ .max.funscript already in v{target_version} format and no originals to handle, skipping")
@@ -662,7 +694,7 @@ def process_scene(
         elif file_mode == 1:
             if scripts_to_handle:
                 originals_dir = os.path.join(os.path.dirname(base_path), 'originalFunscripts')
-                os.makedirs(originals_dir, exist_ok=True)
+                _ensure_dir(originals_dir)
 
                 for axis, file_path in scripts_to_handle.items():
                     if 'originalFunscripts' in file_path:
@@ -671,7 +703,7 @@ def process_scene(
                     filename = os.path.basename(file_path)
                     dest = os.path.join(originals_dir, filename)
                     try:
-                        shutil.move(file_path, dest)
+                        _fast_move(file_path, dest)
                         log(f"  → Moved {filename} to originalFunscripts/")
                     except (OSError, IOError) as e:
                         log(f"  ✗ Error moving {filename}: {e}")
@@ -679,7 +711,7 @@ def process_scene(
             try:
                 if os.path.exists(main_path):
                     os.remove(main_path)
-                shutil.move(max_path, main_path)
+                _fast_move(max_path, main_path)
                 log(f"  ✓ Renamed .max.funscript to .funscript")
                 return True
             except (OSError, IOError) as e:
@@ -698,21 +730,21 @@ def process_scene(
             try:
                 if os.path.exists(main_path):
                     os.remove(main_path)
-                shutil.move(max_path, main_path)
+                _fast_move(max_path, main_path)
                 log(f"  ✓ Renamed .max.funscript to .funscript")
                 return True
             except (OSError, IOError) as e:
                 log(f"  ✗ Error renaming .max.funscript: {e}")
                 return False
 
-    scripts_paths = find_funscript_paths(base_path)
+    scripts_paths = find_funscript_paths(base_path, cached=False)
 
     if not scripts_paths:
         log("  ⊘ No funscripts found")
         return False
 
     if len(scripts_paths) == 1:
-        single_path = list(scripts_paths.values())[0]
+        single_path = next(iter(scripts_paths.values()))
         data = read_funscript_json(single_path)
         if data and is_merged_funscript(data):
             from funscript_utils import get_funscript_version, convert_funscript_format
@@ -725,7 +757,7 @@ def process_scene(
                 return False
 
             log(f"  ⟳ Converting from v{current_version} to v{target_version}...")
-            converted = convert_funscript_format(data, target_version)
+            converted = convert_funscript_format(data, target_version, current_version)
 
             if converted and save_funscript(single_path, converted):
                 log(f"  ✓ Converted to v{target_version} format")
@@ -738,7 +770,8 @@ def process_scene(
         return False
 
     if 'main' in scripts_paths:
-        main_data = read_funscript_json(scripts_paths['main'])
+        # routing only needs the version and channels, the actions are read if unmerging
+        main_data = read_funscript_header(scripts_paths['main'])
         if main_data and is_merged_funscript(main_data):
             from funscript_utils import get_funscript_version, get_merged_channels, unmerge_funscript
 
@@ -749,15 +782,16 @@ def process_scene(
             originals_dir = os.path.join(os.path.dirname(base_path), 'originalFunscripts')
             base_name = os.path.basename(base_path)
             original_scripts = {}
+            _, original_entries = scan_dir(originals_dir)
 
-            original_main = os.path.join(originals_dir, f"{base_name}.funscript")
-            if os.path.exists(original_main):
-                original_scripts['main'] = original_main
+            original_main = f"{base_name}.funscript"
+            if has_entry(original_entries, originals_dir, original_main):
+                original_scripts['main'] = os.path.join(originals_dir, original_main)
 
             for channel in merged_channels:
-                original_channel = os.path.join(originals_dir, f"{base_name}.{channel}.funscript")
-                if os.path.exists(original_channel):
-                    original_scripts[channel] = original_channel
+                original_channel = f"{base_name}.{channel}.funscript"
+                if has_entry(original_entries, originals_dir, original_channel):
+                    original_scripts[channel] = os.path.join(originals_dir, original_channel)
 
             all_originals_found = 'main' in original_scripts and all(
                 channel in original_scripts for channel in merged_channels)
@@ -777,13 +811,13 @@ def process_scene(
                     dest_name = os.path.basename(original_path)
                     dest_path = os.path.join(os.path.dirname(base_path), dest_name)
                     try:
-                        shutil.move(original_path, dest_path)
+                        _fast_move(original_path, dest_path)
                         log(f"  → Moved {dest_name} from originalFunscripts/")
                     except (OSError, IOError) as e:
                         log(f"  ✗ Error moving {dest_name}: {e}")
                         return False
 
-                scripts_paths = find_funscript_paths(base_path)
+                scripts_paths = find_funscript_paths(base_path, cached=False)
                 if not scripts_paths:
                     log("  ✗ Error: No scripts found after cleanup")
                     return False
@@ -792,10 +826,11 @@ def process_scene(
 
             else:
                 log("  ⚠ Original 1.0 scripts not found, will unmerge to extract them")
+                main_data = read_funscript_json(scripts_paths['main'])
 
                 if not scripts_paths['main'].endswith('.max.funscript'):
                     try:
-                        shutil.move(scripts_paths['main'], max_path)
+                        _fast_move(scripts_paths['main'], max_path)
                         log(f"  → Renamed to .max.funscript for unmerging")
                     except (OSError, IOError) as e:
                         log(f"  ✗ Error renaming to .max.funscript: {e}")
@@ -820,7 +855,7 @@ def process_scene(
                 except (OSError, IOError) as e:
                     log(f"  ✗ Error deleting merged script: {e}")
 
-                scripts_paths = find_funscript_paths(base_path)
+                scripts_paths = find_funscript_paths(base_path, cached=False)
                 if not scripts_paths:
                     log("  ✗ Error: No scripts found after unmerge")
                     return False
@@ -886,7 +921,7 @@ def unmerge_scene(
         True if unmerged successfully, False if skipped or error
     """
     from funscript_utils import (
-        get_funscript_version,
+        peek_funscript_version,
         get_merged_channels,
         unmerge_funscript
     )
@@ -906,17 +941,18 @@ def unmerge_scene(
         log("  ⊘ No main funscript found")
         return False
 
-    data = read_funscript_json(main_path)
-    if not data:
-        log("  ✗ Error: Could not read funscript")
-        return False
-
-    version = get_funscript_version(data)
+    # most scenes are single-axis, so check the version before decoding the actions
+    version = peek_funscript_version(main_path)
     if version == '1.0':
         log("  ⊘ Not a merged funscript, skipping")
         return False
 
-    merged_channels = get_merged_channels(data)
+    data = read_funscript_json(main_path) if version else None
+    if not data:
+        log("  ✗ Error: Could not read funscript")
+        return False
+
+    merged_channels = get_merged_channels(data, version)
     log(f"  → Merged script contains: {', '.join(merged_channels)}")
 
     existing_files = []
@@ -932,12 +968,11 @@ def unmerge_scene(
             os.path.dirname(base_path),
             'originalFunscripts'
         )
-        if os.path.exists(originals_dir):
-            for channel in merged_channels:
-                filename = f"{os.path.basename(base_path)}.{channel}.funscript"
-                channel_path = os.path.join(originals_dir, filename)
-                if os.path.exists(channel_path) and channel not in existing_files:
-                    existing_files.append(channel)
+        _, original_entries = scan_dir(originals_dir)
+        for channel in merged_channels:
+            filename = f"{os.path.basename(base_path)}.{channel}.funscript"
+            if has_entry(original_entries, originals_dir, filename) and channel not in existing_files:
+                existing_files.append(channel)
 
     if existing_files:
         log(f"  ⊘ Files already exist: {', '.join(existing_files)}")
@@ -945,14 +980,14 @@ def unmerge_scene(
 
     max_path = f"{base_path}.max.funscript"
     try:
-        shutil.move(main_path, max_path)
+        _fast_move(main_path, max_path)
         log(f"  → Renamed {os.path.basename(main_path)} to .max.funscript")
     except (OSError, IOError) as e:
         log(f"  ✗ Error renaming: {e}")
         return False
 
     log(f"  ⟳ Splitting v{version} merged script...")
-    saved_files = unmerge_funscript(data, base_path)
+    saved_files = unmerge_funscript(data, base_path, version)
 
     if saved_files:
         log(f"  ✓ Created {len(saved_files)} funscript files:")
@@ -967,13 +1002,133 @@ def unmerge_scene(
         return True
     else:
         try:
-            shutil.move(max_path, main_path)
+            _fast_move(max_path, main_path)
             log("  ✗ Unmerge failed, restored original")
         except (OSError, IOError):
             log("  ✗ Unmerge failed, could not restore original")
         return False
 
 
+def _run_batch_scene(
+    scene_fn: Callable[[str, str, Dict], bool],
+    idx: int,
+    total: int,
+    scene: Dict,
+    settings: Dict
+) -> Tuple[str, str]:
+    """
+    Run scene_fn for one batch scene with its log captured.
+
+    Returns:
+        ('done' | 'skipped' | 'error', captured log text)
+    """
+    captured = io.StringIO()
+    with contextlib.redirect_stderr(captured):
+        scene_id = scene.get('id')
+        title = scene.get('title', 'Untitled')
+        file_path = scene.get('file_path')
+
+        if not file_path:
+            log(f"[{idx}/{total}] Scene {scene_id}: No file path")
+            return 'skipped', captured.getvalue()
+
+        base_path = os.path.splitext(file_path)[0]
+
+        log(f"[{idx}/{total}] {title}")
+
+        try:
+            outcome = 'done' if scene_fn(scene_id, base_path, settings) else 'skipped'
+        except Exception as e:
+            log(f"  ✗ Error: {e}")
+            outcome = 'error'
+
+        log("")
+    return outcome, captured.getvalue()
+
+
+def _run_batch(
+    scenes: List[Dict],
+    scene_fn: Callable[[str, str, Dict], bool],
+    settings: Dict
+) -> Tuple[int, int, int]:
+    """
+    Run scene_fn over all scenes, directories in parallel on BATCH_WORKERS processes.
+
+    Scenes in one directory share variant, axis and originalFunscripts files, so
+    they run one after another in order; the next scene of a directory is only
+    submitted once the previous one has finished. Logs are written in scene
+    order as each scene finishes.
+
+    Returns:
+        (done_count, skipped_count, error_count)
+    """
+    total = len(scenes)
+    groups = {}
+    for idx, scene in enumerate(scenes, 1):
+        file_path = scene.get('file_path')
+        key = os.path.dirname(file_path) if file_path else None
+        groups.setdefault(key, []).append((idx, scene))
+
+    counts = {'done': 0, 'skipped': 0, 'error': 0}
+    results = {}
+    next_idx = 1
+
+    def collect(scene_results):
+        nonlocal next_idx
+        for idx, outcome, text in scene_results:
+            results[idx] = (outcome, text)
+        while next_idx in results:
+            outcome, text = results.pop(next_idx)
+            counts[outcome] += 1
+            sys.stderr.write(text)
+            sys.stderr.flush()
+            next_idx += 1
+
+    def failed(idx, scene, e):
+        return (idx, 'error', f"[{idx}/{total}] Scene {scene.get('id')}\n  ✗ Error: {e}\n\n")
+
+    executor = None
+    if BATCH_WORKERS > 1 and len(groups) > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(BATCH_WORKERS, len(groups)))
+        except (OSError, NotImplementedError, ImportError) as e:
+            # no multiprocessing support here (e.g. missing sem_open), run serially
+            log(f"  → Running scenes serially: {e}")
+
+    if executor is None:
+        for idx, scene in enumerate(scenes, 1):
+            collect([(idx, *_run_batch_scene(scene_fn, idx, total, scene, settings))])
+    else:
+        with executor:
+            pending = {}
+
+            def submit_next(queue):
+                # start the next scene of a directory, failing the rest if the pool is gone
+                for idx, scene in queue:
+                    try:
+                        future = executor.submit(_run_batch_scene, scene_fn, idx, total, scene, settings)
+                    except Exception as e:
+                        collect([failed(idx, scene, e)])
+                        continue
+                    pending[future] = (idx, scene, queue)
+                    return
+
+            for items in groups.values():
+                submit_next(iter(items))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, scene, queue = pending.pop(future)
+                    try:
+                        collect([(idx, *future.result())])
+                    except Exception as e:
+                        # worker died, nothing is known about this scene
+                        collect([failed(idx, scene, e)])
+                    submit_next(queue)
+
+    return counts['done'], counts['skipped'], counts['error']
+
+
 def batch_merge_scenes(server_connection: Dict, settings: Dict):
     """
     Batch process all interactive scenes for merging.
@@ -1006,34 +1161,7 @@ def batch_merge_scenes(server_connection: Dict, settings: Dict):
     log(f"Found {len(scenes)} interactive scene(s)")
     log("")
 
-    merged_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    for idx, scene in enumerate(scenes, 1):
-        scene_id = scene.get('id')
-        title = scene.get('title', 'Untitled')
-        file_path = scene.get('file_path')
-
-        if not file_path:
-            log(f"[{idx}/{len(scenes)}] Scene {scene_id}: No file path")
-            skipped_count += 1
-            continue
-
-        base_path = os.path.splitext(file_path)[0]
-
-        log(f"[{idx}/{len(scenes)}] {title}")
-
-        try:
-            if process_scene(scene_id, base_path, settings):
-                merged_count += 1
-            else:
-                skipped_count += 1
-        except Exception as e:
-            log(f"  ✗ Error: {e}")
-            error_count += 1
-
-        log("")
+    merged_count, skipped_count, error_count = _run_batch(scenes, process_scene, settings)
 
     log("=" * 60)
     log("Summary:")
@@ -1075,34 +1203,7 @@ def batch_unmerge_scenes(server_connection: Dict, settings: Dict):
     log(f"Found {len(scenes)} interactive scene(s)")
     log("")
 
-    unmerged_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    for idx, scene in enumerate(scenes, 1):
-        scene_id = scene.get('id')
-        title = scene.get('title', 'Untitled')
-        file_path = scene.get('file_path')
-
-        if not file_path:
-            log(f"[{idx}/{len(scenes)}] Scene {scene_id}: No file path")
-            skipped_count += 1
-            continue
-
-        base_path = os.path.splitext(file_path)[0]
-
-        log(f"[{idx}/{len(scenes)}] {title}")
-
-        try:
-            if unmerge_scene(scene_id, base_path, settings):
-                unmerged_count += 1
-            else:
-                skipped_count += 1
-        except Exception as e:
-            log(f"  ✗ Error: {e}")
-            error_count += 1
-
-        log("")
+    unmerged_count, skipped_count, error_count = _run_batch(scenes, unmerge_scene, settings)
 
     log("=" * 60)
     log("Summary:")